@@ -1,4 +1,36 @@
+"""fuzz only imports the :py:class:`.Value` class up front. Everything else
+is imported the first time it is used, so that ``import fuzz`` stays cheap for
+short-lived scripts which only need Values."""
+
 from .values import Value
 
 __author__ = "Sam Ireland"
 __version__ = "0.1.1"
+
+_LAZY = {
+ "ValueArray": "arrays",
+ "GroupBy": "groups",
+ "Bootstrap": "bootstrap",
+ "Node": "reactive",
+ "CalibrationTable": "calibration",
+ "Encoder": "serialization",
+ "Decoder": "serialization",
+ "Comparison": "comparison",
+ "Writer": "export",
+ "sigma_clip": "clipping",
+ "sigma_clip_groups": "clipping",
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+        attribute = getattr(import_module("." + _LAZY[name], __name__), name)
+        globals()[name] = attribute
+        return attribute
+    raise AttributeError("module {!r} has no attribute {!r}".format(
+     __name__, name
+    ))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
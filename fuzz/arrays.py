@@ -0,0 +1,833 @@
+"""Contains the ValueArray class."""
+
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import nlargest, nsmallest
+from itertools import accumulate, repeat
+from math import fsum, hypot, sqrt
+from operator import add, mul, sub
+from .values import Value
+
+_FORMATS = {"float64": "d", "float32": "f", "float16": "H"}
+_PRECISIONS = ["float16", "float32", "float64"]
+_BUFFER_DTYPES = {"d": "float64", "f": "float32", "e": "float16"}
+_TYPESTRS = {"float64": "f8", "float32": "f4", "float16": "f2"}
+_ORDERINGS = ["value", "error", "relative_error", "lower", "upper"]
+
+class ValueArray:
+    """A ValueArray is a fixed-length collection of Values, stored as two
+    packed numeric buffers (one for the values, one for the errors) rather than
+    as individual :py:class:`.Value` objects.
+
+    A single Value object costs well over a hundred bytes, most of it Python
+    bookkeeping. A ValueArray of float32 values and float16 errors costs six
+    bytes per Value, and you can get that down to four by using a `shared`
+    error - if you pass a single number as the error, every Value in the array
+    has that same uncertainty and no error buffer is stored at all.
+
+    The supported dtypes are ``"float64"``, ``"float32"`` and ``"float16"``,
+    and the values and errors can each have their own. Arithmetic is always
+    done in double precision, and the result is then stored at the wider of
+    the two operands' dtypes (a ValueArray combined with a Value or a number
+    keeps its own dtypes). This means the only accuracy lost is the rounding
+    when a result is stored - at most one part in 2\\ :sup:`24` (about 6e-8)
+    for float32, and one part in 2\\ :sup:`11` (about 5e-4) for float16. That
+    is fine for an error that only needs two or three significant figures, but
+    float16 values between -6e-5 and 6e-5 lose relative precision, and
+    anything larger than 65504 cannot be stored as float16 at all.
+
+    ValueArrays can be added, subtracted, multiplied and divided with other
+    ValueArrays of the same length, with Values, and with numbers, and they can
+    be raised to a numeric power. The errors are propagated exactly as they
+    would be for the equivalent :py:class:`.Value` operations. The same goes
+    for the series operations - :py:meth:`.cumsum`, :py:meth:`.cumprod`,
+    :py:meth:`.diff`, :py:meth:`.gradient` and :py:meth:`.resample`.
+
+    Indexing a ValueArray with an integer gives you a :py:class:`.Value`, and
+    indexing it with a slice gives you a new ValueArray. A slice of a
+    ValueArray made with :py:meth:`.from_buffers` shares those buffers, unless
+    it has a step, in which case its Values are copied so that its buffers
+    stay contiguous.
+
+    The value and error buffers can be handed to other libraries without
+    copying them - see :py:meth:`.value_buffer`, :py:meth:`.error_buffer` and
+    :py:meth:`.from_buffers`. ValueArrays also have an
+    ``__array_interface__``, so ``numpy.asarray(array)`` gives you a read-only
+    NumPy view of the values, and on Python 3.12 and later they support the
+    buffer protocol directly, again exposing the values.
+
+    :param values: An iterable of ``int`` or ``float`` values.
+    :param errors: Either an iterable of errors, one per value, or a single\
+    error shared by all values. By default this is zero.
+    :param str dtype: The dtype to store the values as.
+    :param str error_dtype: The dtype to store the errors as. By default this\
+    is the same as ``dtype``.
+    :raises TypeError: if the values or errors are not numeric.
+    :raises ValueError: if a dtype is not supported, if any error is negative,\
+    or if the number of errors doesn't match the number of values.
+    :raises OverflowError: if a number is too large for its dtype."""
+
+    def __init__(self, values, errors=0, dtype="float64", error_dtype=None):
+        if error_dtype is None: error_dtype = dtype
+        _check_dtype(dtype)
+        _check_dtype(error_dtype)
+        self._dtype, self._error_dtype = dtype, error_dtype
+        self._values = _encode(values, dtype)
+        if isinstance(errors, (int, float)):
+            self._errors = None
+            self._error = _shared_error(errors, error_dtype)
+        else:
+            errors = list(errors)
+            _check_errors(errors, len(self._values))
+            self._errors, self._error = _encode(errors, error_dtype), None
+
+
+    @staticmethod
+    def from_values(values, dtype="float64", error_dtype=None):
+        """This is a static method, and serves as an alternate constructor for
+        ValueArrays. It takes an iterable of :py:class:`.Value` objects (or
+        plain numbers, which are given an error of zero) and packs them into a
+        ValueArray, keeping their errors.
+
+        :param values: The Values to pack.
+        :param str dtype: The dtype to store the values as.
+        :param str error_dtype: The dtype to store the errors as.
+        :rtype: :py:class:`.ValueArray`"""
+
+        numbers, errors = _unpack(values)
+        return ValueArray(numbers, errors, dtype=dtype, error_dtype=error_dtype)
+
+
+    @staticmethod
+    def from_buffers(values, errors=0, dtype=None, error_dtype=None):
+        """This is a static method, and serves as an alternate constructor for
+        ValueArrays. It creates a ValueArray on top of existing buffers - a
+        NumPy array, an ``array.array``, a ``bytearray`` or anything else that
+        supports the buffer protocol - without copying them. The ValueArray
+        will see any changes later made to those buffers.
+
+        The dtype of each buffer is worked out from its format if it has one
+        (NumPy float16 arrays included), so you only need to give the dtype for
+        untyped buffers like ``bytes``. The buffers must be contiguous.
+
+        :param values: A buffer of values.
+        :param errors: Either a buffer of errors, or a single error shared by\
+        all values. By default this is zero.
+        :param str dtype: The dtype of the values buffer.
+        :param str error_dtype: The dtype of the errors buffer (or of the\
+        shared error). By default a shared error has the values' dtype.
+        :raises TypeError: if an object is not a contiguous buffer, or its dtype\
+        can't be worked out.
+        :raises ValueError: if a dtype doesn't match its buffer, if any error is\
+        negative, or if there are a different number of values and errors.
+        :rtype: :py:class:`.ValueArray`"""
+
+        values, dtype = _view(values, dtype)
+        if isinstance(errors, (int, float)):
+            if error_dtype is None: error_dtype = dtype
+            _check_dtype(error_dtype)
+            errors, error = None, _shared_error(errors, error_dtype)
+        else:
+            errors, error_dtype = _view(errors, error_dtype)
+            _check_errors(_decode(errors, error_dtype) if
+             error_dtype == "float16" else errors, len(values))
+            error = None
+        array = ValueArray.__new__(ValueArray)
+        array._dtype, array._error_dtype = dtype, error_dtype
+        array._values, array._errors, array._error = values, errors, error
+        return array
+
+
+    def __repr__(self):
+        return "<ValueArray ({} Values)>".format(len(self))
+
+
+    def __len__(self):
+        return len(self._values)
+
+
+    def __reduce_ex__(self, protocol):
+        errors = self._errors
+        if errors is not None: errors = _pickleable(errors, protocol)
+        return (_rebuild, (
+         _pickleable(self._values, protocol), errors, self._error,
+         self._dtype, self._error_dtype
+        ))
+
+
+    def __buffer__(self, flags):
+        return self.value_buffer()
+
+
+    @property
+    def __array_interface__(self):
+        return {
+         "version": 3, "shape": (len(self._values),),
+         "typestr": ("<" if sys.byteorder == "little" else ">")
+         + _TYPESTRS[self._dtype],
+         "data": self.value_buffer()
+        }
+
+
+    def __iter__(self):
+        errors = self._error_list()
+        for value, error in zip(self._value_list(), errors):
+            yield Value(value, error)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            errors = self._errors
+            if errors is not None: errors = _slice(errors, index)
+            return self._derive(
+             _slice(self._values, index), errors, self._error
+            )
+        value = _item(self._values, index, self._dtype)
+        if self._errors is None: return Value(value, self._error)
+        return Value(value, _item(self._errors, index, self._error_dtype))
+
+
+    def __add__(self, other):
+        operand = self._operand(other)
+        if operand is None: return NotImplemented
+        values, errors, shared, dtype, error_dtype = operand
+        return ValueArray(
+         list(map(add, self._value_list(), values)),
+         self._sum_errors(errors, shared), dtype=dtype, error_dtype=error_dtype
+        )
+
+
+    def __radd__(self, other):
+        return self + other
+
+
+    def __sub__(self, other):
+        operand = self._operand(other)
+        if operand is None: return NotImplemented
+        values, errors, shared, dtype, error_dtype = operand
+        return ValueArray(
+         list(map(sub, self._value_list(), values)),
+         self._sum_errors(errors, shared), dtype=dtype, error_dtype=error_dtype
+        )
+
+
+    def __rsub__(self, other):
+        operand = self._operand(other)
+        if operand is None: return NotImplemented
+        values, errors, shared, dtype, error_dtype = operand
+        return ValueArray(
+         list(map(sub, values, self._value_list())),
+         self._sum_errors(errors, shared), dtype=dtype, error_dtype=error_dtype
+        )
+
+
+    def __mul__(self, other):
+        operand = self._operand(other)
+        if operand is None: return NotImplemented
+        values, errors, shared, dtype, error_dtype = operand
+        results, result_errors = [], []
+        for value, error, other_value, other_error in zip(
+         self._value_list(), self._error_list(), values, errors
+        ):
+            result = value * other_value
+            results.append(result)
+            result_errors.append(hypot(
+             error / abs(value) if value else 0,
+             other_error / abs(other_value) if other_value else 0
+            ) * abs(result))
+        return ValueArray(
+         results, result_errors, dtype=dtype, error_dtype=error_dtype
+        )
+
+
+    def __rmul__(self, other):
+        return self * other
+
+
+    def __truediv__(self, other):
+        operand = self._operand(other)
+        if operand is None: return NotImplemented
+        values, errors, shared, dtype, error_dtype = operand
+        return self._divide(
+         self._value_list(), self._error_list(), values, errors,
+         dtype, error_dtype
+        )
+
+
+    def __rtruediv__(self, other):
+        operand = self._operand(other)
+        if operand is None: return NotImplemented
+        values, errors, shared, dtype, error_dtype = operand
+        return self._divide(
+         values, errors, self._value_list(), self._error_list(),
+         dtype, error_dtype
+        )
+
+
+    def __pow__(self, other):
+        if not isinstance(other, (int, float)): return NotImplemented
+        results, errors = [], []
+        for value, error in zip(self._value_list(), self._error_list()):
+            result = value ** other
+            results.append(result)
+            errors.append(
+             (error / abs(value) if value else 0) * abs(other) * abs(result)
+            )
+        return ValueArray(
+         results, errors, dtype=self._dtype, error_dtype=self._error_dtype
+        )
+
+
+    def values(self):
+        """Returns the values of the array, without their errors.
+
+        :rtype: ``list``"""
+
+        return self._value_list()
+
+
+    def errors(self):
+        """Returns the errors of the array. If the array has a shared error,
+        this will be that error repeated once per value.
+
+        :rtype: ``list``"""
+
+        return self._error_list()
+
+
+    def value_buffer(self):
+        """Returns a read-only ``memoryview`` of the values, sharing memory with
+        the array rather than copying it.
+
+        float16 values can't be represented by a ``memoryview`` directly, so
+        for them you get the raw bits as unsigned 16-bit integers - NumPy users
+        can get the values back with ``numpy.frombuffer(buffer, "float16")``.
+
+        :rtype: ``memoryview``"""
+
+        return memoryview(self._values).toreadonly()
+
+
+    def error_buffer(self):
+        """Returns a read-only ``memoryview`` of the errors, in the same way as
+        :py:meth:`.value_buffer`. If the array has a shared error there is no
+        error buffer to share, so a new one is created, with the error repeated
+        once per value.
+
+        :rtype: ``memoryview``"""
+
+        if self._errors is None:
+            return memoryview(_encode(
+             repeat(self._error, len(self._values)), self._error_dtype
+            )).toreadonly()
+        return memoryview(self._errors).toreadonly()
+
+
+    def shared_error(self):
+        """Returns the error shared by every value in the array, or ``None`` if
+        each value has its own error.
+
+        :rtype: ``float``"""
+
+        return self._error
+
+
+    def dtype(self):
+        """Returns the dtype the values are stored as.
+
+        :rtype: ``str``"""
+
+        return self._dtype
+
+
+    def error_dtype(self):
+        """Returns the dtype the errors are stored as.
+
+        :rtype: ``str``"""
+
+        return self._error_dtype
+
+
+    def nbytes(self):
+        """Returns the number of bytes taken up by the array's value and error
+        buffers.
+
+        :rtype: ``int``"""
+
+        size = len(self._values) * self._values.itemsize
+        if self._errors is not None:
+            size += len(self._errors) * self._errors.itemsize
+        return size
+
+
+    def argsort(self, by="value", reverse=False):
+        """Returns the indices that would sort the array. By default the Values
+        are ordered by value alone, just as ``<`` would order them, but you can
+        also order them by ``"error"``, ``"relative_error"``, or by the
+        ``"lower"`` or ``"upper"`` end of their :py:meth:`.Value.error_range`.
+
+        The sort is stable, so Values which tie keep their original order.
+
+        :param str by: What to order the Values by.
+        :param bool reverse: If ``True``, the order is largest first.
+        :raises ValueError: if ``by`` is not a supported ordering.
+        :rtype: ``list``"""
+
+        keys = self._keys(by)
+        return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+
+    def sort(self, by="value", reverse=False):
+        """Returns a sorted copy of the array. The arguments are the same as
+        for :py:meth:`.argsort`.
+
+        :param str by: What to order the Values by.
+        :param bool reverse: If ``True``, the order is largest first.
+        :raises ValueError: if ``by`` is not a supported ordering.
+        :rtype: :py:class:`.ValueArray`"""
+
+        if self._errors is None and by in ("value", "lower", "upper"):
+            return ValueArray(
+             sorted(self._value_list(), reverse=reverse), self._error,
+             dtype=self._dtype, error_dtype=self._error_dtype
+            )
+        return self._take(self.argsort(by=by, reverse=reverse))
+
+
+    def rank(self, by="value"):
+        """Returns the rank of each Value - its position, counting from zero,
+        in the array's sorted order. Ties are ranked in the order they appear.
+
+        :param str by: What to order the Values by.
+        :raises ValueError: if ``by`` is not a supported ordering.
+        :rtype: ``list``"""
+
+        ranks = [0] * len(self._values)
+        for rank, index in enumerate(self.argsort(by=by)):
+            ranks[index] = rank
+        return ranks
+
+
+    def top(self, count, by="value", largest=True):
+        """Returns the largest (or smallest) Values in the array, largest (or
+        smallest) first. This only needs one pass over the array, so is much
+        quicker than sorting the whole thing when ``count`` is small.
+
+        :param int count: How many Values to return.
+        :param str by: What to order the Values by.
+        :param bool largest: If ``False``, the smallest Values are returned.
+        :raises ValueError: if ``by`` is not a supported ordering.
+        :rtype: :py:class:`.ValueArray`"""
+
+        keys = self._keys(by)
+        return self._take((nlargest if largest else nsmallest)(
+         count, range(len(keys)), key=keys.__getitem__
+        ))
+
+
+    def searchsorted(self, targets, side="left"):
+        """Finds where values would have to be inserted to keep the array in
+        order, by binary search. The array must already be sorted by value.
+
+        A single target (a number or a :py:class:`.Value`, whose error is
+        ignored) gives a single index, and an iterable of targets gives a list
+        of indices. With ``side="left"`` a target equal to some value goes
+        before it, and with ``side="right"`` it goes after.
+
+        Each target takes about log\ :sub:`2` n comparisons. The values of a
+        float16 array are decoded one at a time as the search reaches them,
+        rather than all at once, so each comparison is slower than for other
+        dtypes but a single lookup never costs more than a few dozen of them.
+
+        :param targets: The value or values to look for.
+        :param str side: Which side of equal values to insert at.
+        :raises ValueError: if ``side`` is not ``"left"`` or ``"right"``.
+        :rtype: ``int`` or ``list``"""
+
+        if side not in ("left", "right"):
+            raise ValueError("Side must be 'left' or 'right', not {}".format(
+             side
+            ))
+        search = bisect_left if side == "left" else bisect_right
+        values = self._values
+        if self._dtype == "float16": values = _Float16Sequence(values)
+        if isinstance(targets, (Value, int, float)):
+            return search(values, _number(targets))
+        return [search(values, _number(target)) for target in targets]
+
+
+    def cumsum(self):
+        """Returns the running totals of the array - the first Value, then
+        the first two added together, and so on. Each total's error is the one
+        you would get by adding the Values up one by one, but it is worked out
+        in a single pass as the square root of a running total of the squared
+        errors.
+
+        :rtype: :py:class:`.ValueArray`"""
+
+        errors = self._error_list()
+        return ValueArray(
+         list(accumulate(self._value_list())),
+         list(map(sqrt, accumulate(map(mul, errors, errors)))),
+         dtype=self._dtype, error_dtype=self._error_dtype
+        )
+
+
+    def cumprod(self):
+        """Returns the running products of the array. As with
+        :py:meth:`.cumsum`, the errors are the ones you would get by
+        multiplying the Values together one by one - here worked out from a
+        running total of the squared relative errors.
+
+        :rtype: :py:class:`.ValueArray`"""
+
+        values = self._value_list()
+        products = list(accumulate(values, mul))
+        relative_errors = accumulate([(error / value) ** 2 if value else 0
+         for value, error in zip(values, self._error_list())])
+        return ValueArray(products, list(map(
+         mul, map(sqrt, relative_errors), map(abs, products)
+        )), dtype=self._dtype, error_dtype=self._error_dtype)
+
+
+    def diff(self):
+        """Returns the differences between each Value and the one before it,
+        so the result has one fewer Value than the array.
+
+        :rtype: :py:class:`.ValueArray`"""
+
+        values = self._value_list()
+        if self._errors is None:
+            errors = hypot(self._error, self._error)
+        else:
+            errors = self._error_list()
+            errors = list(map(hypot, errors[1:], errors))
+        return ValueArray(
+         list(map(sub, values[1:], values)), errors,
+         dtype=self._dtype, error_dtype=self._error_dtype
+        )
+
+
+    def gradient(self, spacing=1):
+        """Returns the gradient of the array, taking the Values to be evenly
+        spaced samples of some quantity. As with NumPy's ``gradient``, the
+        gradient at each interior point is the central difference between its
+        neighbours, and the two end points use the difference to the one
+        neighbour they have. The result is the same length as the array.
+
+        :param spacing: The distance between consecutive samples.
+        :raises ValueError: if there are fewer than two Values, or the\
+        spacing is zero.
+        :rtype: :py:class:`.ValueArray`"""
+
+        if len(self._values) < 2:
+            raise ValueError("Need at least two Values for a gradient")
+        if not spacing:
+            raise ValueError("The spacing of samples cannot be zero")
+        values, errors = self._value_list(), self._error_list()
+        scale = 1 / spacing
+        gradients = [(values[1] - values[0]) * scale] + [
+         difference * scale / 2 for difference in map(sub, values[2:], values)
+        ] + [(values[-1] - values[-2]) * scale]
+        scale = abs(scale)
+        errors = [hypot(errors[1], errors[0]) * scale] + [
+         error * scale / 2 for error in map(hypot, errors[2:], errors)
+        ] + [hypot(errors[-1], errors[-2]) * scale]
+        return ValueArray(
+         gradients, errors, dtype=self._dtype, error_dtype=self._error_dtype
+        )
+
+
+    def resample(self, size):
+        """Down-samples the array by averaging it in blocks - the first
+        ``size`` Values, then the next ``size``, and so on. If the length of
+        the array isn't a multiple of ``size``, the last block is the mean of
+        however many Values are left. As with :py:meth:`.GroupBy.mean`, each
+        block's error is its errors added in quadrature, divided by the number
+        of Values in it.
+
+        :param int size: The number of Values in each block.
+        :raises ValueError: if the size is less than one.
+        :rtype: :py:class:`.ValueArray`"""
+
+        if size < 1:
+            raise ValueError("Block size must be at least 1, not {}".format(
+             size
+            ))
+        values, length = self._value_list(), len(self._values)
+        starts = range(0, length, size)
+        counts = [min(size, length - start) for start in starts]
+        means = [fsum(values[start:start + size]) / count
+         for start, count in zip(starts, counts)]
+        if self._errors is None and length % size == 0:
+            errors = self._error / sqrt(size)
+        else:
+            errors = self._error_list()
+            errors = [hypot(*errors[start:start + size]) / count
+             for start, count in zip(starts, counts)]
+        return ValueArray(
+         means, errors, dtype=self._dtype, error_dtype=self._error_dtype
+        )
+
+
+    def _value_list(self):
+        return _decode(self._values, self._dtype)
+
+
+    def _error_list(self):
+        if self._errors is None: return [self._error] * len(self._values)
+        return _decode(self._errors, self._error_dtype)
+
+
+    def _keys(self, by):
+        """Returns a list of the quantity the array is being ordered by."""
+
+        if by not in _ORDERINGS:
+            raise ValueError("Can't order Values by {}".format(by))
+        if by == "value": return self._value_list()
+        if by == "error": return self._error_list()
+        if by == "lower":
+            return list(map(sub, self._value_list(), self._error_list()))
+        if by == "upper":
+            return list(map(add, self._value_list(), self._error_list()))
+        return [error / abs(value) if value else 0
+         for value, error in zip(self._value_list(), self._error_list())]
+
+
+    def _take(self, indices):
+        """Returns a new ValueArray made of the Values at the given indices."""
+
+        values = list(map(self._value_list().__getitem__, indices))
+        if self._errors is None:
+            errors = self._error
+        else:
+            errors = list(map(self._error_list().__getitem__, indices))
+        return ValueArray(
+         values, errors, dtype=self._dtype, error_dtype=self._error_dtype
+        )
+
+
+    def _derive(self, values, errors, error):
+        derived = ValueArray.__new__(ValueArray)
+        derived._dtype, derived._error_dtype = self._dtype, self._error_dtype
+        derived._values, derived._errors, derived._error = values, errors, error
+        return derived
+
+
+    def _operand(self, other):
+        """Takes the other operand of some arithmetic operation and returns its
+        values and errors in a form that can be zipped with this array's own,
+        along with its shared error (if it has one) and the dtypes the result
+        should be stored as. If the operand can't be combined with a
+        ValueArray, ``None`` is returned."""
+
+        if isinstance(other, ValueArray):
+            if len(other) != len(self):
+                raise ValueError("Cannot combine {} Values with {}".format(
+                 len(self), len(other)
+                ))
+            return (
+             other._value_list(), other._error_list(), other._error,
+             _promote(self._dtype, other._dtype),
+             _promote(self._error_dtype, other._error_dtype)
+            )
+        if isinstance(other, Value):
+            return (
+             repeat(other._value), repeat(other._error), other._error,
+             self._dtype, self._error_dtype
+            )
+        if isinstance(other, (int, float)):
+            return repeat(other), repeat(0), 0, self._dtype, self._error_dtype
+
+
+    def _sum_errors(self, errors, shared):
+        if self._errors is None and shared is not None:
+            return hypot(self._error, shared)
+        return list(map(hypot, self._error_list(), errors))
+
+
+    @staticmethod
+    def _divide(values, errors, other_values, other_errors, dtype, error_dtype):
+        results, result_errors = [], []
+        for value, error, other_value, other_error in zip(
+         values, errors, other_values, other_errors
+        ):
+            result = value / other_value
+            results.append(result)
+            result_errors.append(hypot(
+             error / abs(value) if value else 0,
+             other_error / abs(other_value)
+            ) * abs(result))
+        return ValueArray(
+         results, result_errors, dtype=dtype, error_dtype=error_dtype
+        )
+
+
+
+class _Float16Sequence:
+    """Wraps a float16 buffer as a read-only sequence of floats, so that
+    ``bisect`` can search it while only decoding the values it looks at."""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+
+
+    def __len__(self):
+        return len(self._buffer)
+
+
+    def __getitem__(self, index):
+        return _item(self._buffer, index, "float16")
+
+
+
+def _unpack(values):
+    """Splits an iterable of Values (or numbers, which are given an error of
+    zero) into a list of values and a list of errors."""
+
+    values = list(values)
+    if set(map(type, values)) == {Value}:
+        return [value._value for value in values], [
+         value._error for value in values
+        ]
+    numbers, errors = [], []
+    for value in values:
+        if isinstance(value, Value):
+            numbers.append(value._value)
+            errors.append(value._error)
+        else:
+            numbers.append(value)
+            errors.append(0)
+    return numbers, errors
+
+
+def _pickleable(buffer, protocol):
+    """Wraps a buffer for pickling. From protocol 5 onwards this is a
+    ``PickleBuffer``, which can be sent out-of-band without being copied into
+    the pickle."""
+
+    view = memoryview(buffer)
+    if protocol >= 5 and view.contiguous:
+        from pickle import PickleBuffer
+        return PickleBuffer(view)
+    return view.tobytes()
+
+
+def _rebuild(values, errors, error, dtype, error_dtype):
+    """Recreates a pickled ValueArray."""
+
+    return ValueArray.from_buffers(
+     values, error if errors is None else errors,
+     dtype=dtype, error_dtype=error_dtype
+    )
+
+
+def _number(value):
+    return value._value if isinstance(value, Value) else value
+
+
+def _check_dtype(dtype):
+    if dtype not in _FORMATS:
+        raise ValueError("{} is not a supported dtype".format(dtype))
+
+
+def _shared_error(error, dtype):
+    """Checks a single shared error and rounds it to its dtype's precision."""
+
+    if isinstance(error, bool):
+        raise TypeError("error {} is not an int or a float".format(error))
+    if error < 0:
+        raise ValueError("error {} is negative".format(error))
+    return _decode(_encode([error], dtype), dtype)[0]
+
+
+def _check_errors(errors, count):
+    """Checks that a sequence of errors has one error per value, and that
+    none of them are bools or negative."""
+
+    _check_bools(errors, "error")
+    if len(errors) != count:
+        raise ValueError("{} values but {} errors".format(count, len(errors)))
+    if len(errors) and min(errors) < 0:
+        raise ValueError("error {} is negative".format(min(errors)))
+
+
+def _check_bools(numbers, name):
+    """Raises a ``TypeError`` if a sequence of numbers has any bools in it."""
+
+    if bool in set(map(type, numbers)):
+        raise TypeError("{} {} is not an int or a float".format(
+         name, next(number for number in numbers if isinstance(number, bool))
+        ))
+
+
+def _view(buffer, dtype):
+    """Takes an object supporting the buffer protocol and returns a flat
+    ``memoryview`` of it in the format used to store the given dtype, along
+    with the dtype (which is worked out from the buffer if not given). No data
+    is copied."""
+
+    view = memoryview(buffer)
+    own_dtype = _BUFFER_DTYPES.get(view.format.lstrip("@="))
+    if dtype is None:
+        if own_dtype is None:
+            raise TypeError("Can't get a dtype from buffer format {}".format(
+             view.format
+            ))
+        dtype = own_dtype
+    _check_dtype(dtype)
+    if own_dtype not in (None, dtype):
+        raise ValueError("Can't read a {} buffer as {}".format(own_dtype, dtype))
+    return view.cast("B").cast(_FORMATS[dtype]), dtype
+
+
+def _encode(numbers, dtype):
+    """Packs an iterable of numbers into a new buffer of the given dtype.
+    float16 isn't an ``array`` typecode, so float16 buffers hold the raw bits
+    as unsigned shorts and are converted with ``struct`` (going via a double
+    array first, so that bad input raises the same errors as other dtypes).
+    ``array`` would quietly store bools as ones and zeroes, so they are
+    rejected here, as :py:class:`.Value` rejects them."""
+
+    if not isinstance(numbers, array):
+        if not isinstance(numbers, (list, tuple)): numbers = list(numbers)
+        _check_bools(numbers, "value")
+    if dtype == "float16":
+        numbers = array("d", numbers)
+        return array("H", struct.pack("{}e".format(len(numbers)), *numbers))
+    return array(_FORMATS[dtype], numbers)
+
+
+def _decode(buffer, dtype):
+    """Unpacks a buffer of the given dtype into a list of floats."""
+
+    if dtype == "float16":
+        return list(struct.unpack("{}e".format(len(buffer)), buffer))
+    return buffer.tolist()
+
+
+def _item(buffer, index, dtype):
+    """Gets a single float out of a buffer of the given dtype."""
+
+    if dtype == "float16":
+        return struct.unpack("e", struct.pack("H", buffer[index]))[0]
+    return buffer[index]
+
+
+def _slice(buffer, index):
+    """Slices a buffer. Slicing a ``memoryview`` with a step gives a view which
+    isn't contiguous, and so can't be cast, unpacked or shared like the rest,
+    so those slices are copied into a new ``array`` instead."""
+
+    sliced = buffer[index]
+    if isinstance(sliced, memoryview) and not sliced.c_contiguous:
+        return array(sliced.format, sliced.tobytes())
+    return sliced
+
+
+def _promote(dtype, other_dtype):
+    """Returns whichever of two dtypes is the more precise."""
+
+    return max(dtype, other_dtype, key=_PRECISIONS.index)
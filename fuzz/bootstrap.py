@@ -0,0 +1,152 @@
+"""Contains the Bootstrap class, for estimating the uncertainty of arbitrary
+statistics."""
+
+from math import floor
+from random import Random, randrange
+from statistics import stdev
+from .values import Value
+
+_BLOCK_SIZE = 64
+_BLOCK_ITEMS = 65536
+_worker = {}
+
+class Bootstrap:
+    """A Bootstrap estimates the uncertainty of some statistic of a dataset -
+    a median, say, or a fitted parameter - where there is no simple rule for
+    propagating errors through it.
+
+    It works by resampling the data with replacement many times, calculating
+    the statistic for each resample, and looking at how much those estimates
+    vary. The resampling is done as soon as the Bootstrap is created, and the
+    results can then be read off with :py:meth:`.value` and
+    :py:meth:`.interval`.
+
+    Resamples are drawn in blocks - one call to the random number generator
+    per block rather than per resample - and each block has its own generator,
+    seeded from ``seed`` and the block's position. The results therefore only
+    depend on ``seed`` and ``resamples``, and not on how many processes the
+    work was spread over. Blocks hold at most 64 resamples, and fewer for
+    large datasets, so that a block never draws many more items than there
+    are in one resample or a few tens of thousands, whichever is larger. If
+    ``processes`` is more than one (or ``None``, for one per core) the blocks
+    are shared out over a process pool, in which case ``statistic`` must be
+    picklable - a module-level function rather than a lambda.
+
+    The data can be any sequence, including Values or a
+    :py:class:`.ValueArray`, and the statistic will be given a list of the
+    resampled items. If the statistic returns a :py:class:`.Value`, only its
+    value is used.
+
+    :param data: The dataset to resample.
+    :param statistic: A function which takes a list of data and returns a\
+    number.
+    :param int resamples: How many resamples to take.
+    :param int seed: The random seed. If not given, a random one is chosen.
+    :param int processes: How many processes to use.
+    :raises ValueError: if there is no data, or fewer than two resamples."""
+
+    def __init__(self, data, statistic, resamples=1000, seed=None, processes=1):
+        data = list(data)
+        if not data:
+            raise ValueError("Cannot bootstrap an empty dataset")
+        if resamples < 2:
+            raise ValueError("Need at least 2 resamples, not {}".format(
+             resamples
+            ))
+        if seed is None: seed = randrange(2 ** 32)
+        self._value = _number(statistic(data))
+        size = max(1, min(_BLOCK_SIZE, _BLOCK_ITEMS // len(data)))
+        blocks = [(seed, index, min(size, resamples - start))
+         for index, start in enumerate(range(0, resamples, size))]
+        if processes == 1:
+            estimates = [_resample(block, data, statistic) for block in blocks]
+        else:
+            # Imported here, as it pulls in all of multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(
+             processes, initializer=_initialise, initargs=(data, statistic)
+            ) as pool:
+                estimates = list(pool.map(_run_block, blocks))
+        self._estimates = [
+         estimate for block in estimates for estimate in block
+        ]
+
+
+    def __repr__(self):
+        return "<Bootstrap ({} resamples)>".format(len(self._estimates))
+
+
+    def estimates(self):
+        """Returns the statistic's value for each resample.
+
+        :rtype: ``list``"""
+
+        return list(self._estimates)
+
+
+    def value(self):
+        """Returns the statistic of the full dataset, with the standard
+        deviation of the resampled estimates as its error.
+
+        :rtype: :py:class:`.Value`"""
+
+        return Value(self._value, stdev(self._estimates))
+
+
+    def interval(self, confidence=0.95):
+        """Returns a confidence interval for the statistic, taken from the
+        percentiles of the resampled estimates.
+
+        :param float confidence: The fraction of estimates which should fall\
+        inside the interval.
+        :raises ValueError: if the confidence is not between 0 and 1.
+        :rtype: ``tuple``"""
+
+        if not 0 < confidence < 1:
+            raise ValueError("Confidence {} is not between 0 and 1".format(
+             confidence
+            ))
+        estimates = sorted(self._estimates)
+        return (
+         _percentile(estimates, (1 - confidence) / 2),
+         _percentile(estimates, (1 + confidence) / 2)
+        )
+
+
+
+def _initialise(data, statistic):
+    """Stores the data and statistic for :py:func:`_run_block` to use. In a
+    process pool this runs once per worker, so that the data is only sent to
+    each worker once rather than once per block."""
+
+    _worker["data"], _worker["statistic"] = data, statistic
+
+
+def _run_block(block):
+    return _resample(block, _worker["data"], _worker["statistic"])
+
+
+def _resample(block, data, statistic):
+    """Takes a block of ``(seed, index, size)``, draws that many resamples of
+    the data in one go, and returns the statistic of each."""
+
+    seed, index, size = block
+    length = len(data)
+    items = Random("{}:{}".format(seed, index)).choices(data, k=length * size)
+    return [_number(statistic(items[start:start + length]))
+     for start in range(0, length * size, length)]
+
+
+def _number(result):
+    return result.value() if isinstance(result, Value) else result
+
+
+def _percentile(estimates, fraction):
+    """Linearly interpolates a percentile from a sorted list."""
+
+    position = fraction * (len(estimates) - 1)
+    lower = floor(position)
+    upper = min(lower + 1, len(estimates) - 1)
+    return estimates[lower] + (
+     estimates[upper] - estimates[lower]
+    ) * (position - lower)
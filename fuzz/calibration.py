@@ -0,0 +1,210 @@
+"""Contains the CalibrationTable class, for converting readings through a
+measured calibration curve."""
+
+from bisect import bisect_right
+from itertools import repeat
+from math import hypot
+from operator import add, mul, sub
+from .values import Value
+from .arrays import ValueArray, _check_errors, _unpack
+
+class CalibrationTable:
+    """A CalibrationTable is a measured calibration curve - a set of points
+    mapping raw readings to calibrated :py:class:`.Value` objects - which can
+    convert new readings by linear interpolation between those points.
+
+    Everything that can be worked out from the table alone - each segment's
+    slope, width and error terms - is worked out once, when the table is
+    created. If the points are evenly spaced, which calibration tables
+    usually are, a reading's segment is found with a single division;
+    otherwise it is found by bisection.
+
+    A reading ``x`` which falls a fraction ``t`` of the way along a segment
+    from ``y0`` to ``y1`` is converted to ``(1 - t) * y0 + t * y1``. The
+    error of the result combines the errors of the two points, weighted by
+    how close the reading is to each, with the reading's own error scaled by
+    the segment's slope - all in quadrature. (Chaining Value operations
+    together would count ``y0``'s error twice, as it appears in both the
+    offset and the slope.)
+
+    The readings in the table (the `x` points) are taken to be exact, so if
+    Values are given for them their errors are ignored. Readings outside the
+    table are an error, unless ``extrapolate`` is ``True``, in which case the
+    end segments are extended.
+
+    :param readings: The raw readings at each point of the table.
+    :param values: The calibrated Values at each point (numbers are given an\
+    error of zero).
+    :param bool extrapolate: Whether to allow readings outside the table.
+    :raises ValueError: if there are fewer than two points, a different\
+    number of readings and values, or two points with the same reading."""
+
+    def __init__(self, readings, values, extrapolate=False):
+        readings = [
+         reading._value if isinstance(reading, Value) else reading
+         for reading in readings
+        ]
+        values, errors = _unpack(values)
+        if len(readings) != len(values):
+            raise ValueError("{} readings but {} values".format(
+             len(readings), len(values)
+            ))
+        if len(readings) < 2:
+            raise ValueError("A calibration table needs at least two points")
+        order = sorted(range(len(readings)), key=readings.__getitem__)
+        self._readings = [readings[index] for index in order]
+        self._values = [values[index] for index in order]
+        self._errors = [errors[index] for index in order]
+        self._extrapolate = extrapolate
+        self._slopes, self._scales, widths = [], [], []
+        for index in range(len(self._readings) - 1):
+            width = self._readings[index + 1] - self._readings[index]
+            if not width:
+                raise ValueError("Two points have the reading {}".format(
+                 self._readings[index]
+                ))
+            widths.append(width)
+            self._scales.append(1 / width)
+            self._slopes.append(
+             (self._values[index + 1] - self._values[index]) / width
+            )
+        step = (self._readings[-1] - self._readings[0]) / len(widths)
+        uniform = all(abs(width - step) <= step * 1e-9 for width in widths)
+        self._step = step if uniform else None
+
+
+    def __repr__(self):
+        return "<CalibrationTable ({} points)>".format(len(self._readings))
+
+
+    def __len__(self):
+        return len(self._readings)
+
+
+    def __call__(self, reading):
+        """Converts a single reading. If the reading is a :py:class:`.Value`,
+        its error is propagated into the result.
+
+        :param reading: The reading to convert.
+        :raises ValueError: if the reading is outside the table and the table\
+        doesn't extrapolate.
+        :rtype: :py:class:`.Value`"""
+
+        if isinstance(reading, Value):
+            return Value(*self._interpolate(reading._value, reading._error))
+        return Value(*self._interpolate(reading, 0))
+
+
+    def convert(self, readings, errors=0):
+        """Converts a whole batch of readings at once. The readings can be a
+        :py:class:`.ValueArray`, an iterable of Values, or an iterable of plain
+        numbers with a separate ``errors`` argument (which can be an iterable
+        or a single error shared by every plain number). Readings which are
+        Values always use their own errors.
+
+        :param readings: The readings to convert.
+        :param errors: The errors of the readings, if they are plain numbers.
+        :raises ValueError: if any reading is outside the table and the table\
+        doesn't extrapolate, any error is negative, or there are a different\
+        number of readings and errors.
+        :rtype: :py:class:`.ValueArray`"""
+
+        if isinstance(readings, ValueArray):
+            readings, errors = readings.values(), readings.errors()
+        else:
+            readings = list(readings)
+            if isinstance(errors, (int, float)):
+                errors = [errors] * len(readings)
+            else:
+                errors = list(errors)
+            _check_errors(errors, len(readings))
+            if any(map(isinstance, readings, repeat(Value))):
+                errors = [reading._error if isinstance(reading, Value)
+                 else error for reading, error in zip(readings, errors)]
+                readings = [reading._value if isinstance(reading, Value)
+                 else reading for reading in readings]
+        if not readings: return ValueArray([])
+        if not self._extrapolate and (
+         min(readings) < self._readings[0] or max(readings) > self._readings[-1]
+        ):
+            raise ValueError("Readings {} to {} are outside the table".format(
+             min(readings), max(readings)
+            ))
+        indices = self._locate(readings)
+        offsets = list(map(
+         sub, readings, map(self._readings.__getitem__, indices)
+        ))
+        slopes = list(map(self._slopes.__getitem__, indices))
+        values = list(map(add, map(
+         self._values.__getitem__, indices
+        ), map(mul, offsets, slopes)))
+        fractions = map(mul, offsets, map(self._scales.__getitem__, indices))
+        errors = [hypot(
+         (1 - fraction) * lower, fraction * upper, slope * error
+        ) for fraction, lower, upper, slope, error in zip(
+         fractions, map(self._errors.__getitem__, indices),
+         map(self._errors.__getitem__, map(add, indices, repeat(1))),
+         slopes, errors
+        )]
+        return ValueArray(values, errors)
+
+
+    def readings(self):
+        """Returns the readings at each point of the table, in order.
+
+        :rtype: ``list``"""
+
+        return list(self._readings)
+
+
+    def values(self):
+        """Returns the calibrated Values at each point of the table.
+
+        :rtype: ``list``"""
+
+        return [Value(value, error) for value, error in zip(
+         self._values, self._errors
+        )]
+
+
+    def is_uniform(self):
+        """Returns ``True`` if the table's points are evenly spaced, in which
+        case segments are looked up directly rather than by bisection.
+
+        :rtype: ``bool``"""
+
+        return self._step is not None
+
+
+    def _locate(self, readings):
+        """Finds the index of the segment each of a list of readings falls
+        in."""
+
+        last = len(self._slopes) - 1
+        if self._step is None:
+            indices = map(
+             sub, map(bisect_right, repeat(self._readings), readings), repeat(1)
+            )
+        else:
+            first, step = self._readings[0], self._step
+            indices = [int((reading - first) / step) for reading in readings]
+        if self._extrapolate:
+            return [min(max(index, 0), last) for index in indices]
+        return list(map(min, indices, repeat(last)))
+
+
+    def _interpolate(self, reading, error):
+        """Converts a reading with some error, returning the value and error of
+        the result."""
+
+        if not self._extrapolate and not (
+         self._readings[0] <= reading <= self._readings[-1]
+        ):
+            raise ValueError("Reading {} is outside the table".format(reading))
+        index = self._locate([reading])[0]
+        offset = reading - self._readings[index]
+        fraction, slope = offset * self._scales[index], self._slopes[index]
+        return self._values[index] + offset * slope, hypot(
+         (1 - fraction) * self._errors[index],
+         fraction * self._errors[index + 1], slope * error
+        )
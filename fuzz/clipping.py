@@ -0,0 +1,170 @@
+"""Contains functions for rejecting outliers from sets of Values by sigma
+clipping."""
+
+from itertools import compress, repeat
+from math import fsum
+from operator import add, and_, ge, le, mul, sub
+from statistics import median
+from .arrays import ValueArray, _check_errors, _unpack
+from .groups import weighted_mean
+from .values import Value
+
+def sigma_clip(values, errors=None, threshold=3, iterations=5, lower=None,
+ upper=None):
+    """Rejects outliers from a set of repeated measurements, and returns the
+    weighted mean of what is left.
+
+    Each pass takes the inverse-variance weighted mean of the Values still
+    included (see :py:func:`.groups.weighted_mean`), and rejects any Value
+    more than ``threshold`` of its own errors away from it. This repeats until
+    a pass rejects nothing, or ``iterations`` passes have been made - pass
+    ``None`` to keep going until nothing more is rejected. Rejected Values
+    stay rejected, so this always comes to an end.
+
+    The first pass measures distances from the median rather than the mean,
+    so that a single wild outlier with a small error can't drag the mean far
+    enough to make every other Value look like an outlier too.
+
+    Nothing is copied between passes. The range of means each Value is
+    consistent with, and its weight in the mean, are worked out once, at the
+    start, and after that each pass is a couple of comparisons per Value and a
+    sum over the Values still included, done with built-in functions rather
+    than :py:class:`.Value` operations. If a pass would reject every
+    remaining Value, it is abandoned and the previous pass's result is used.
+
+    The Values can be given as a :py:class:`.ValueArray`, as an iterable of
+    Values, or as an iterable of plain numbers with a separate ``errors``
+    argument - which can itself be a single number if every value has the same
+    error. You can also reject Values below the mean and above it at different
+    thresholds, with ``lower`` and ``upper``.
+
+    :param values: The Values to clip.
+    :param errors: The errors of the values, if ``values`` is plain numbers.
+    :param threshold: How many errors away from the mean a Value can be.
+    :param int iterations: The most passes to make.
+    :param lower: The threshold for Values below the mean, if different.
+    :param upper: The threshold for Values above the mean, if different.
+    :raises ValueError: if there are no values, any error is zero or\
+    negative, a threshold is not positive, there are fewer than one\
+    iterations, or there are a different number of values and errors.
+    :returns: The clipped weighted mean as a :py:class:`.Value`, and a list\
+    with ``True`` for each Value which was kept and ``False`` for each Value\
+    which was rejected."""
+
+    numbers, errors = _split(values, errors)
+    lower, upper = _check_arguments(threshold, iterations, lower, upper)
+    return _clip(numbers, errors, lower, upper, iterations)
+
+
+def sigma_clip_groups(keys, values, errors=None, threshold=3, iterations=5,
+ lower=None, upper=None):
+    """Sigma clips many independent groups of Values at once - readings
+    tagged with the sensor they came from, say - as if
+    :py:func:`.sigma_clip` had been called on each group separately.
+
+    The records are bucketed by key in a single pass, as with
+    :py:class:`.GroupBy`, and each group is then clipped on its own. The
+    masks of the groups are put back together into one mask for all the
+    records, in their original order.
+
+    :param keys: The key of each record.
+    :param values: The Values to clip.
+    :param errors: The errors of the values, if ``values`` is plain numbers.
+    :param threshold: How many errors away from the mean a Value can be.
+    :param int iterations: The most passes to make.
+    :param lower: The threshold for Values below the mean, if different.
+    :param upper: The threshold for Values above the mean, if different.
+    :raises ValueError: if any group's Values can't be clipped, or there are\
+    a different number of keys and values.
+    :raises TypeError: if the keys aren't hashable.
+    :returns: A ``dict`` of each key's clipped weighted mean, in the order\
+    each key was first seen, and a list with ``True`` for each record which\
+    was kept and ``False`` for each record which was rejected."""
+
+    keys = list(keys)
+    numbers, errors = _split(values, errors)
+    lower, upper = _check_arguments(threshold, iterations, lower, upper)
+    if len(keys) != len(numbers):
+        raise ValueError("{} keys but {} values".format(
+         len(keys), len(numbers)
+        ))
+    groups = {}
+    for index, key in enumerate(keys):
+        try:
+            groups[key].append(index)
+        except KeyError:
+            groups[key] = [index]
+    means, mask = {}, [False] * len(numbers)
+    for key, indices in groups.items():
+        means[key], kept = _clip(
+         list(map(numbers.__getitem__, indices)),
+         list(map(errors.__getitem__, indices)), lower, upper, iterations
+        )
+        for index in compress(indices, kept):
+            mask[index] = True
+    return means, mask
+
+
+
+def _split(values, errors):
+    """Takes Values in any of the accepted forms, and returns a list of values
+    and a list of errors."""
+
+    if isinstance(values, ValueArray):
+        return values.values(), values.errors()
+    if errors is None: return _unpack(values)
+    numbers = list(values)
+    if isinstance(errors, (int, float)):
+        errors = [errors] * len(numbers)
+    else:
+        errors = list(errors)
+        if len(errors) != len(numbers):
+            raise ValueError("{} values but {} errors".format(
+             len(numbers), len(errors)
+            ))
+    _check_errors(errors, len(numbers))
+    return numbers, errors
+
+
+def _check_arguments(threshold, iterations, lower, upper):
+    """Checks the clipping arguments, and returns the lower and upper
+    thresholds."""
+
+    if lower is None: lower = threshold
+    if upper is None: upper = threshold
+    if min(lower, upper) <= 0:
+        raise ValueError("Thresholds must be positive")
+    if iterations is not None and iterations < 1:
+        raise ValueError("Need at least 1 iteration, not {}".format(
+         iterations
+        ))
+    return lower, upper
+
+
+def _clip(numbers, errors, lower, upper, iterations):
+    """Sigma clips one set of values, returning the clipped weighted mean and
+    the mask of kept values. A value is kept by a pass if the centre lies
+    between its floor and its ceiling, which are worked out up front along
+    with the weights, so that each new mean is just two masked sums."""
+
+    floors = list(map(sub, numbers, map(mul, errors, repeat(upper))))
+    ceilings = list(map(add, numbers, map(mul, errors, repeat(lower))))
+    mask = [True] * len(numbers)
+    mean = weighted_mean(numbers, errors)
+    weights = list(map(pow, errors, repeat(-2)))
+    products = list(map(mul, numbers, weights))
+    centre, passes = median(numbers), 0
+    while iterations is None or passes < iterations:
+        passes += 1
+        kept = list(map(and_, mask, map(and_,
+         map(le, floors, repeat(centre)), map(ge, ceilings, repeat(centre))
+        )))
+        if not any(kept) or (kept == mask and passes > 1): break
+        if kept != mask:
+            mask = kept
+            total = fsum(compress(weights, mask))
+            mean = Value(
+             fsum(compress(products, mask)) / total, total ** -0.5
+            )
+        centre = mean._value
+    return mean, mask
@@ -0,0 +1,231 @@
+"""Contains the Comparison class, for comparing every Value in one collection
+with every Value in another."""
+
+import os
+from array import array
+from collections import deque
+from math import inf, sqrt
+from .arrays import ValueArray, _unpack
+
+_worker = {}
+
+class Comparison:
+    """A Comparison compares every Value in one collection - a new batch of
+    measurements, say - with every Value in another, such as a reference
+    catalogue. For each pair ``a`` and ``b`` it works out the significance of
+    their difference, ``|a - b| / sqrt(σa² + σb²)`` (how many standard
+    deviations apart they are), and whether they are consistent in the sense
+    of :py:meth:`.Value.consistent_with`.
+
+    There are ``n × m`` pairs, which for large collections is far too many to
+    hold at once, so nothing is calculated when the Comparison is created.
+    Instead the pairs are worked through in square tiles of ``tile_size``
+    rows by ``tile_size`` columns, with each row of a tile calculated by a
+    handful of built-in calls rather than a :py:class:`.Value` operation per
+    pair. :py:meth:`.tiles` gives you the tiles one at a time, and
+    :py:meth:`.significant` gives you just the pairs which differ by at least
+    some threshold, working through a tile's worth of pairs at a time - whole
+    rows if a tile holds at least one row, or pieces of a row if it doesn't -
+    so that memory use is bounded by the tile size and not by the number of
+    pairs.
+
+    If ``processes`` is more than one (or ``None``, for one per core) the
+    tiles (or pieces) are shared out over a process pool. Each worker is sent
+    the two collections once, and results are collected in order with only a
+    few tiles in flight at a time.
+
+    The collections can be :py:class:`.ValueArray` objects or iterables of
+    Values (numbers are given an error of zero). If two Values both have an
+    error of zero, the significance of their difference is infinite unless
+    they are equal, in which case it is zero.
+
+    :param first: The Values for the rows of the comparison.
+    :param second: The Values for the columns of the comparison.
+    :param int tile_size: The number of rows and columns in each tile.
+    :param int processes: How many processes to use.
+    :raises ValueError: if the tile size is less than one."""
+
+    def __init__(self, first, second, tile_size=512, processes=1):
+        if tile_size < 1:
+            raise ValueError("Tile size must be at least 1, not {}".format(
+             tile_size
+            ))
+        self._data = _prepare(first) + _prepare(second)
+        self._tile_size = tile_size
+        self._processes = processes
+
+
+    def __repr__(self):
+        return "<Comparison ({} × {} pairs)>".format(*self.shape())
+
+
+    def shape(self):
+        """Returns the number of Values in each collection - that is, the
+        number of rows and columns in the comparison.
+
+        :rtype: ``tuple``"""
+
+        return (len(self._data[0]), len(self._data[3]))
+
+
+    def tiles(self):
+        """Yields the comparison one tile at a time, working along each band
+        of rows before moving on to the next. Each tile is a tuple of the index
+        of its first row, the index of its first column, a list of
+        significance rows (each an ``array`` of floats) and a list of
+        consistency rows (each a ``bytes`` of ones and zeroes).
+
+        :rtype: ``generator``"""
+
+        yield from self._run(None)
+
+
+    def significant(self, threshold=3):
+        """Yields every pair whose significance is at least some threshold, as
+        a tuple of the row index, the column index and the significance. Pairs
+        come out in row order, and the filtering happens in the workers, so
+        only the significant pairs are ever collected.
+
+        :param threshold: The smallest significance to yield.
+        :rtype: ``generator``"""
+
+        for pairs in self._run(threshold):
+            yield from pairs
+
+
+    def matrix(self):
+        """Returns the full matrix of significances, as a list of rows. This
+        holds every pair in memory at once, so is only suitable for smaller
+        comparisons.
+
+        :rtype: ``list``"""
+
+        rows = [array("d") for _ in range(self.shape()[0])]
+        for row, _, significances, _ in self.tiles():
+            for offset, significance in enumerate(significances):
+                rows[row + offset].extend(significance)
+        return rows
+
+
+    def _run(self, threshold):
+        """Works through the comparison in order, either here or in a process
+        pool, and yields the result for each piece. Without a threshold the
+        pieces are tiles. With one they have no more pairs than a tile, but
+        are whole rows, or pieces of a single row, so that the significant
+        pairs come out in row order."""
+
+        rows, columns = self.shape()
+        if threshold is None:
+            tasks = ((_compare, (row, column, self._tile_size))
+             for row in range(0, rows, self._tile_size)
+             for column in range(0, columns, self._tile_size))
+        else:
+            area = self._tile_size * self._tile_size
+            width = min(columns, area) or 1
+            height = max(1, area // width)
+            tasks = ((_filter, (row, height, column, width, threshold))
+             for row in range(0, rows, height)
+             for column in range(0, columns, width))
+        if self._processes == 1:
+            for function, task in tasks:
+                yield function(task, self._data)
+            return
+        # Imported here, as it pulls in all of multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        window = 2 * (self._processes or os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+         self._processes, initializer=_initialise, initargs=(self._data,)
+        ) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(_run_task, task))
+                if len(pending) >= window: yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+
+def _prepare(values):
+    """Turns a collection of Values into lists of values, errors and squared
+    errors."""
+
+    if isinstance(values, ValueArray):
+        numbers, errors = values.values(), values.errors()
+    else:
+        numbers, errors = _unpack(values)
+    return numbers, errors, [error * error for error in errors]
+
+
+def _initialise(data):
+    """Stores the collections for :py:func:`_run_task` to use. This runs once
+    per worker, so that the data is only sent to each worker once."""
+
+    _worker["data"] = data
+
+
+def _run_task(task):
+    function, task = task
+    return function(task, _worker["data"])
+
+
+def _compare(task, data):
+    """Takes a tile of ``(row, column, size)`` and returns its position along
+    with its significance and consistency rows."""
+
+    row, column, size = task
+    values, errors, squares, others, other_errors, other_squares = data
+    others = others[column:column + size]
+    other_errors = other_errors[column:column + size]
+    other_squares = other_squares[column:column + size]
+    significances, consistencies = [], []
+    for value, error, square in zip(
+     values[row:row + size], errors[row:row + size], squares[row:row + size]
+    ):
+        try:
+            significances.append(array("d", [abs(other - value) / sqrt(
+             other_square + square
+            ) for other, other_square in zip(others, other_squares)]))
+        except ZeroDivisionError:
+            significances.append(array("d", [_significance(
+             abs(other - value), other_square + square
+            ) for other, other_square in zip(others, other_squares)]))
+        consistencies.append(bytes([abs(other - value) <= other_error + error
+         for other, other_error in zip(others, other_errors)]))
+    return row, column, significances, consistencies
+
+
+def _filter(task, data):
+    """Takes a piece of ``(row, height, column, width, threshold)`` and
+    returns the pairs in it whose significance is at least the threshold, in
+    row order. Squared differences are compared against the squared threshold
+    first, so that the significance (and its square root) is only worked out
+    for the pairs which pass."""
+
+    row, height, column, width, threshold = task
+    values, _, squares, others, _, other_squares = data
+    others = others[column:column + width]
+    other_squares = other_squares[column:column + width]
+    # Slightly loosened, so that rounding can't exclude a pair which the
+    # exact check below would include
+    limit = max(threshold, 0) ** 2 * (1 - 1e-9)
+    pairs = []
+    for index in range(row, min(row + height, len(values))):
+        value, square = values[index], squares[index]
+        for offset, other, other_square in [
+         (offset, other, other_square) for offset, (other, other_square)
+         in enumerate(zip(others, other_squares))
+         if (other - value) * (other - value) >= limit * (other_square + square)
+        ]:
+            significance = _significance(
+             abs(other - value), other_square + square
+            )
+            if significance >= threshold:
+                pairs.append((index, column + offset, significance))
+    return pairs
+
+
+def _significance(difference, variance):
+    """Works out a single significance, allowing for a variance of zero."""
+
+    if variance: return difference / sqrt(variance)
+    return inf if difference else 0.0
@@ -0,0 +1,249 @@
+"""Contains tools for formatting Values in bulk, and writing them out as CSV,
+TSV or JSON lines."""
+
+import json
+from itertools import chain, islice, repeat
+from math import floor, isfinite, log10
+from .arrays import ValueArray, _unpack
+
+_FORMATS = {
+ "csv": ("", "%s,", "%s,%s\n"),
+ "tsv": ("", "%s\t", "%s\t%s\n"),
+ "jsonl": ("{", '"label": %s, ', '"value": %s, "error": %s}\n'),
+}
+_JSON_NUMBERS = {"nan": "NaN", "inf": "Infinity", "-inf": "-Infinity"}
+
+def format_value(value, figures=2):
+    """Formats a single :py:class:`.Value` the way its ``repr`` does, but with
+    the error rounded to some number of significant figures and the value
+    rounded to the same decimal place - so ``Value(12.3456, 0.0234)`` becomes
+    ``"12.346 ± 0.023"``, rather than showing digits the error says are
+    meaningless. Values with no error are shown in full.
+
+    :param value: The Value (or number) to format.
+    :param int figures: How many significant figures to give the error.
+    :raises ValueError: if ``figures`` is less than one.
+    :rtype: ``str``"""
+
+    return format_values([value], figures=figures)[0]
+
+
+def format_values(values, figures=2):
+    """Formats many Values at once, in the same way as
+    :py:func:`.format_value`. Rather than formatting each Value separately,
+    the rounding is worked out for all of them together and they are then
+    formatted with a single string operation, which is several times quicker
+    than calling ``repr`` on each one.
+
+    :param values: A :py:class:`.ValueArray` or an iterable of Values.
+    :param int figures: How many significant figures to give the errors.
+    :raises ValueError: if ``figures`` is less than one.
+    :rtype: ``list``"""
+
+    _check_figures(figures)
+    if isinstance(values, ValueArray):
+        numbers, errors = values.values(), values.errors()
+    else:
+        numbers, errors = _unpack(values)
+    if not numbers: return []
+    rounded = _round(numbers, errors, figures)
+    if rounded is not None:
+        places, numbers, errors = rounded
+        return (("%.*f ± %.*f\n" * len(numbers)) % tuple(chain.from_iterable(
+         zip(places, numbers, places, errors)
+        ))).split("\n")[:-1]
+    return ["{} ± {}".format(*_round_one(value, error, figures))
+     if error else repr(value) for value, error in zip(numbers, errors)]
+
+
+
+class Writer:
+    """A Writer writes Values to a text stream (usually a file opened with
+    ``open(path, "w", newline="")``) as rows of a table, one Value per row,
+    with the value and error in separate columns. The formats are ``"csv"``,
+    ``"tsv"`` and ``"jsonl"`` (JSON lines, one object per row), and each
+    Value is rounded as in :py:func:`.format_value`.
+
+    Rows are formatted and written ``chunk_size`` at a time, each chunk with a
+    single string operation and a single write, so memory use depends on the
+    chunk size and not on how many Values are written. For CSV and TSV a
+    header row is written before the first chunk, unless ``header`` is
+    ``False``.
+
+    :param stream: The text stream to write to.
+    :param str format: The format to write in.
+    :param int figures: How many significant figures to give the errors.
+    :param bool header: Whether to write a header row.
+    :param int chunk_size: How many rows to format at once.
+    :raises ValueError: if the format is not supported, or ``figures`` or\
+    ``chunk_size`` is less than one."""
+
+    def __init__(self, stream, format="csv", figures=2, header=True,
+     chunk_size=8192):
+        if format not in _FORMATS:
+            raise ValueError("Can't write Values as {}".format(format))
+        _check_figures(figures)
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1, not {}".format(
+             chunk_size
+            ))
+        self._stream, self._format = stream, format
+        self._figures, self._chunk_size = figures, chunk_size
+        self._header = header and format != "jsonl"
+        self._labelled = None
+
+
+    def __repr__(self):
+        return "<Writer ({})>".format(self._format)
+
+
+    def write(self, values, labels=None):
+        """Writes some Values to the stream. If ``labels`` are given, each row
+        starts with the matching label in an extra ``label`` column - but
+        every call to the same Writer must either give labels or not.
+
+        :param values: A :py:class:`.ValueArray` or an iterable of Values.
+        :param labels: An optional label for each Value.
+        :raises ValueError: if there are a different number of labels and\
+        Values, or labels are given to a Writer which has already written rows\
+        without them (or the other way round).
+        :returns: The number of rows written."""
+
+        labelled = labels is not None
+        if self._labelled is None:
+            self._labelled = labelled
+            if self._header:
+                separator = "\t" if self._format == "tsv" else ","
+                self._stream.write(separator.join(
+                 ["label", "value", "error"] if labelled else ["value", "error"]
+                ) + "\n")
+        elif labelled != self._labelled:
+            raise ValueError("Every write must {}include labels".format(
+             "" if self._labelled else "not "
+            ))
+        if labelled: labels = iter(labels)
+        rows = 0
+        for numbers, errors in _chunks(values, self._chunk_size):
+            chunk_labels = None
+            if labelled:
+                chunk_labels = list(islice(labels, len(numbers)))
+                if len(chunk_labels) != len(numbers):
+                    raise ValueError("There are fewer labels than Values")
+            self._stream.write(self._format_chunk(
+             numbers, errors, chunk_labels
+            ))
+            rows += len(numbers)
+        if labelled and next(labels, None) is not None:
+            raise ValueError("There are more labels than Values")
+        return rows
+
+
+    def _format_chunk(self, numbers, errors, labels):
+        """Formats a chunk of rows as one string."""
+
+        start, label, body = _FORMATS[self._format]
+        rounded = _round(numbers, errors, self._figures)
+        if rounded is None:
+            columns = list(zip(*map(
+             _round_one, numbers, errors, repeat(self._figures)
+            )))
+            if self._format == "jsonl":
+                columns = [[_JSON_NUMBERS.get(number, number)
+                 for number in column] for column in columns]
+        else:
+            places, numbers, errors = rounded
+            body = body.replace("%s", "%.*f")
+            columns = [places, numbers, places, errors]
+        if labels is not None:
+            if self._format == "jsonl":
+                columns.insert(0, list(map(json.dumps, labels)))
+            else:
+                columns.insert(0, list(map(_quote, labels, repeat(
+                 "\t" if self._format == "tsv" else ","
+                ))))
+            start += label
+        return ((start + body) * len(numbers)) % tuple(
+         chain.from_iterable(zip(*columns))
+        )
+
+
+
+def _check_figures(figures):
+    if figures < 1:
+        raise ValueError("Need at least 1 significant figure, not {}".format(
+         figures
+        ))
+
+
+def _chunks(values, size):
+    """Splits a :py:class:`.ValueArray` or an iterable of Values into chunks,
+    each as a list of values and a list of errors."""
+
+    if isinstance(values, ValueArray):
+        for start in range(0, len(values), size):
+            chunk = values[start:start + size]
+            yield chunk.values(), chunk.errors()
+    else:
+        values = iter(values)
+        while True:
+            numbers, errors = _unpack(islice(values, size))
+            if not numbers: return
+            yield numbers, errors
+
+
+def _round(values, errors, figures):
+    """Works out how many decimal places each value and error should be
+    rounded to, ready for a ``%.*f`` template, and returns them along with the
+    values and errors. Where the rounding is to the left of the decimal point,
+    the value and error are rounded here and given no decimal places. If any
+    row can't be formatted this way - a zero or non-finite error, or a
+    non-finite value - ``None`` is returned instead."""
+
+    # An error which rounds up to the next power of ten has one fewer decimal
+    # place, so errors are scaled up by half a unit in the last figure first
+    scale = 1 / (1 - 0.5 * 10 ** -figures)
+    try:
+        places = [figures - 1 - floor(log10(error * scale)) for error in errors]
+    except (ValueError, OverflowError):
+        return None
+    if not isfinite(sum(values)): return None
+    if min(places) < 0:
+        values, errors = list(values), list(errors)
+        for index, place in enumerate(places):
+            if place < 0:
+                values[index] = _round_left(values[index], place)
+                errors[index] = _round_left(errors[index], place)
+                places[index] = 0
+    return places, values, errors
+
+
+def _round_one(value, error, figures):
+    """Rounds a single value and error, allowing for the cases that
+    :py:func:`_round` can't handle, and returns them as strings."""
+
+    if not error or not isfinite(error) or not isfinite(value):
+        return repr(value), repr(error)
+    places = figures - 1 - floor(log10(error / (1 - 0.5 * 10 ** -figures)))
+    if places >= 0:
+        return "%.*f" % (places, value), "%.*f" % (places, error)
+    return (
+     "%.0f" % _round_left(value, places), "%.0f" % _round_left(error, places)
+    )
+
+
+def _round_left(number, places):
+    """Rounds a number to some negative number of decimal places - to the
+    nearest hundred for -2, say - giving an ``int``."""
+
+    factor = 10 ** -places
+    return round(number / factor) * factor
+
+
+def _quote(label, separator):
+    """Quotes a label for CSV or TSV output, if it needs quoting. As with the
+    ``csv`` module, ``None`` is written as an empty field."""
+
+    label = "" if label is None else str(label)
+    if separator in label or '"' in label or "\n" in label or "\r" in label:
+        return '"{}"'.format(label.replace('"', '""'))
+    return label
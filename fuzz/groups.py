@@ -0,0 +1,180 @@
+"""Contains the GroupBy class, for aggregating Values by key."""
+
+from itertools import repeat
+from math import fsum, hypot
+from operator import add, mul, sub
+from .values import Value
+from .arrays import ValueArray, _check_errors, _unpack
+
+class GroupBy:
+    """A GroupBy takes a long run of keyed Values - readings tagged with the
+    sensor they came from, say - and reduces them to one Value per key.
+
+    The records are bucketed by key once, when the GroupBy is created, so
+    that every group becomes a pair of lists of plain numbers. Each reduction
+    is then a handful of built-in calls per group (``math.fsum``, ``min`` etc.)
+    rather than a :py:class:`.Value` operation per record, and you can run as
+    many reductions as you like off the same GroupBy without bucketing
+    again.
+
+    The Values can be given as a :py:class:`.ValueArray`, as an iterable of
+    Values (numbers are given an error of zero), or as an iterable of plain
+    numbers with a separate ``errors`` argument - which can itself be a single
+    number if every value has the same error.
+
+    Keys can be anything hashable, and the mappings that come back are in the
+    order each key was first seen.
+
+    :param keys: The key of each record.
+    :param values: The Values to group.
+    :param errors: The errors of the values, if ``values`` is plain numbers.
+    :raises ValueError: if there are a different number of keys and values,\
+    or any error is negative.
+    :raises TypeError: if the keys aren't hashable."""
+
+    def __init__(self, keys, values, errors=None):
+        keys = list(keys)
+        if isinstance(values, ValueArray):
+            numbers, errors = values.values(), values.errors()
+        elif errors is None:
+            numbers, errors = _unpack(values)
+        else:
+            numbers = list(values)
+            if isinstance(errors, (int, float)):
+                errors = [errors] * len(numbers)
+            else:
+                errors = list(errors)
+        if not len(keys) == len(numbers) == len(errors):
+            raise ValueError("{} keys but {} values and {} errors".format(
+             len(keys), len(numbers), len(errors)
+            ))
+        _check_errors(errors, len(numbers))
+        self._groups = {}
+        for key, value, error in zip(keys, numbers, errors):
+            try:
+                group = self._groups[key]
+            except KeyError:
+                group = self._groups[key] = ([], [])
+            group[0].append(value)
+            group[1].append(error)
+
+
+    def __repr__(self):
+        return "<GroupBy ({} groups)>".format(len(self._groups))
+
+
+    def __len__(self):
+        return len(self._groups)
+
+
+    def keys(self):
+        """Returns the distinct keys, in the order they were first seen.
+
+        :rtype: ``list``"""
+
+        return list(self._groups)
+
+
+    def counts(self):
+        """Returns the number of records with each key.
+
+        :rtype: ``dict``"""
+
+        return {key: len(values) for key, (values, _) in self._groups.items()}
+
+
+    def sum(self):
+        """Returns the sum of each group's Values, with the errors combined in
+        quadrature just as :py:meth:`.Value.__add__` would.
+
+        :rtype: ``dict``"""
+
+        return {key: Value(fsum(values), hypot(*errors))
+         for key, (values, errors) in self._groups.items()}
+
+
+    def mean(self):
+        """Returns the unweighted mean of each group's Values - their sum
+        divided by how many there are.
+
+        :rtype: ``dict``"""
+
+        return {key: Value(
+         fsum(values) / len(values), hypot(*errors) / len(values)
+        ) for key, (values, errors) in self._groups.items()}
+
+
+    def weighted_mean(self):
+        """Returns the inverse-variance weighted mean of each group's Values.
+        Each value is weighted by one over its error squared, and the error of
+        the mean is one over the square root of the summed weights.
+
+        :raises ValueError: if any Value has an error of zero, as it would\
+        have infinite weight.
+        :rtype: ``dict``"""
+
+        return {key: weighted_mean(values, errors)
+         for key, (values, errors) in self._groups.items()}
+
+
+    def min(self):
+        """Returns the Value with the smallest value in each group. As with
+        ``<``, the errors are not taken into account.
+
+        :rtype: ``dict``"""
+
+        return {key: _pick(min, values, errors)
+         for key, (values, errors) in self._groups.items()}
+
+
+    def max(self):
+        """Returns the Value with the largest value in each group. As with
+        ``>``, the errors are not taken into account.
+
+        :rtype: ``dict``"""
+
+        return {key: _pick(max, values, errors)
+         for key, (values, errors) in self._groups.items()}
+
+
+    def consistent(self):
+        """Checks whether the Values in each group are all consistent with one
+        another, in the sense of :py:meth:`.Value.consistent_with`. Every pair
+        of Values in a group is consistent exactly when the largest lower bound
+        of their error ranges is no bigger than the smallest upper bound, so
+        this only needs one pass over each group.
+
+        :rtype: ``dict``"""
+
+        return {
+         key: max(map(sub, values, errors)) <= min(map(add, values, errors))
+         for key, (values, errors) in self._groups.items()
+        }
+
+
+
+def weighted_mean(values, errors):
+    """Takes a sequence of values and a matching sequence of errors and returns
+    their inverse-variance weighted mean as a :py:class:`.Value`.
+
+    :param values: The values to average.
+    :param errors: The error of each value.
+    :raises ValueError: if there are no values, or any error is zero.
+    :rtype: :py:class:`.Value`"""
+
+    if not errors:
+        raise ValueError("Cannot take the weighted mean of no values")
+    if min(errors) <= 0:
+        raise ValueError("Cannot weight a value with an error of zero")
+    weights = list(map(pow, errors, repeat(-2)))
+    total = fsum(weights)
+    return Value(fsum(map(mul, values, weights)) / total, total ** -0.5)
+
+
+
+def _pick(function, values, errors):
+    """Uses ``min`` or ``max`` to pick out one of a group's values, and returns
+    it as a :py:class:`.Value` along with its error."""
+
+    index = function(range(len(values)), key=values.__getitem__)
+    return Value(values[index], errors[index])
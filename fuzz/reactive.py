@@ -0,0 +1,166 @@
+"""Contains the Node class, for Values which remember how they were made."""
+
+from operator import add, mul, pow, sub, truediv
+from weakref import WeakSet
+from .values import Value
+
+class Node:
+    """A Node is a :py:class:`.Value` that knows where it came from. Ordinary
+    Values are detached - once you have added two together, the result has no
+    idea what its operands were, so if one of them is re-measured you have to
+    recalculate everything by hand. Nodes are an opt-in alternative for when
+    that matters.
+
+    You create `input` Nodes from measurements, like so: ``Node(23, 0.2)``.
+    Combining Nodes with the usual operators (or with Values and numbers) gives
+    `derived` Nodes, and :py:meth:`.derive` lets you build a derived Node from
+    any function of Values. :py:meth:`.get` returns a Node's current Value.
+
+    Calling :py:meth:`.set` on an input Node replaces its Value, and marks the
+    Nodes derived from it as out of date - but nothing is recalculated until
+    you actually ask for one of them. At that point, just the out-of-date
+    Nodes it depends on are recalculated, each after its own operands. So the
+    cost of an update is proportional to the part of the graph it affects, and
+    not to the size of the graph as a whole.
+
+    Nodes only hold weak references to the Nodes derived from them, so derived
+    Nodes you no longer refer to are garbage collected as normal.
+
+    :param value: The value.
+    :param error: The uncertainty associated with the value. By default this is\
+    zero.
+    :raises TypeError: if either the value or its error is not numeric.
+    :raises ValueError: if the error is negative."""
+
+    def __init__(self, value, error=0):
+        self._value = Value(value, error)
+        self._function, self._operands = None, ()
+        self._dirty = False
+        self._children = WeakSet()
+
+
+    @staticmethod
+    def derive(function, *operands):
+        """This is a static method, and creates a derived Node from some
+        function and its operands. The operands can be Nodes, Values or
+        numbers, and whenever the Node is recalculated the function will be
+        called with the current Values of the operand Nodes (and the other
+        operands as they are).
+
+        :param function: The function to derive the Node's Value with.
+        :param operands: The arguments to call the function with.
+        :rtype: :py:class:`.Node`"""
+
+        node = Node.__new__(Node)
+        node._value = None
+        node._function, node._operands = function, operands
+        node._dirty = True
+        node._children = WeakSet()
+        for operand in operands:
+            if isinstance(operand, Node): operand._children.add(node)
+        return node
+
+
+    def __repr__(self):
+        return "<Node: {}>".format(self.get())
+
+
+    def __add__(self, other):
+        return Node.derive(add, self, other)
+
+
+    def __radd__(self, other):
+        return Node.derive(add, other, self)
+
+
+    def __sub__(self, other):
+        return Node.derive(sub, self, other)
+
+
+    def __rsub__(self, other):
+        return Node.derive(sub, other, self)
+
+
+    def __mul__(self, other):
+        return Node.derive(mul, self, other)
+
+
+    def __rmul__(self, other):
+        return Node.derive(mul, other, self)
+
+
+    def __truediv__(self, other):
+        return Node.derive(truediv, self, other)
+
+
+    def __rtruediv__(self, other):
+        return Node.derive(truediv, other, self)
+
+
+    def __pow__(self, other):
+        return Node.derive(pow, self, other)
+
+
+    def get(self):
+        """Returns the Node's current Value, first recalculating it (and any
+        out-of-date Nodes it depends on) if it is out of date.
+
+        :rtype: :py:class:`.Value`"""
+
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            if not node._dirty:
+                stack.pop()
+                continue
+            stale = [operand for operand in node._operands
+             if isinstance(operand, Node) and operand._dirty]
+            if stale:
+                stack.extend(stale)
+            else:
+                stack.pop()
+                node._value = node._function(*[
+                 operand._value if isinstance(operand, Node) else operand
+                 for operand in node._operands
+                ])
+                node._dirty = False
+        return self._value
+
+
+    def set(self, value, error=0):
+        """Replaces the Value of an input Node, and marks every Node derived
+        from it as out of date.
+
+        :param value: The new value.
+        :param error: The new error. By default this is zero.
+        :raises ValueError: if the Node is a derived Node."""
+
+        if self._function is not None:
+            raise ValueError("Cannot set the value of a derived Node")
+        self._value = Value(value, error)
+        # Anything derived from a stale Node is already stale, so the search
+        # can stop whenever it reaches one
+        stack = list(self._children)
+        while stack:
+            node = stack.pop()
+            if not node._dirty:
+                node._dirty = True
+                stack.extend(node._children)
+
+
+    def is_input(self):
+        """Returns ``True`` if the Node is an input Node, and ``False`` if it
+        was derived from other Nodes.
+
+        :rtype: ``bool``"""
+
+        return self._function is None
+
+
+    def is_stale(self):
+        """Returns ``True`` if the Node's Value is out of date and will be
+        recalculated the next time it is needed.
+
+        :rtype: ``bool``"""
+
+        return self._dirty
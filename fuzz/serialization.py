@@ -0,0 +1,244 @@
+"""Contains a compact binary format for sending Values between processes."""
+
+import struct
+import sys
+from array import array
+from .values import Value
+from .arrays import ValueArray, _FORMATS, _unpack
+
+_RECORD = struct.Struct("<dd")
+_HEADER = struct.Struct("<2sBBBB2xQd")
+_MAGIC = b"FZ"
+_VERSION = 1
+_CODES = {"float64": 1, "float32": 2, "float16": 3}
+_DTYPES = {code: dtype for dtype, code in _CODES.items()}
+_SIZES = {"float64": 8, "float32": 4, "float16": 2}
+
+def pack_value(value):
+    """Packs a single :py:class:`.Value` (or number) into a fixed-width 16
+    byte record - its value and error as little-endian doubles. Integers come
+    back as floats when unpacked.
+
+    :param value: The Value to pack.
+    :rtype: ``bytes``"""
+
+    if isinstance(value, Value): return _RECORD.pack(value._value, value._error)
+    return _RECORD.pack(value, 0)
+
+
+def unpack_value(record):
+    """Unpacks a 16 byte record made by :py:func:`.pack_value`.
+
+    :param record: The bytes to unpack.
+    :raises ValueError: if the record is the wrong size.
+    :rtype: :py:class:`.Value`"""
+
+    if len(record) != _RECORD.size:
+        raise ValueError("Record is {} bytes, not {}".format(
+         len(record), _RECORD.size
+        ))
+    return Value(*_RECORD.unpack(record))
+
+
+def encode(values):
+    """Encodes a batch of Values as a single contiguous payload - a 24 byte
+    header followed by the raw value buffer and (unless the Values share an
+    error) the raw error buffer, all little-endian. A :py:class:`.ValueArray`
+    is encoded at its own dtypes with its buffers copied straight into the
+    payload; anything else is treated as an iterable of Values and encoded as
+    float64.
+
+    :param values: The Values to encode.
+    :rtype: ``bytes``"""
+
+    return b"".join(_frame(values))
+
+
+def decode(payload):
+    """Decodes a payload made by :py:func:`.encode` back into a
+    :py:class:`.ValueArray`. On little-endian machines (which is nearly all of
+    them) no data is copied - the ValueArray reads directly from the payload.
+
+    :param payload: The bytes (or any buffer) to decode.
+    :raises ValueError: if the payload is not a valid fuzz payload.
+    :rtype: :py:class:`.ValueArray`"""
+
+    payload = memoryview(payload).cast("B")
+    dtype, error_dtype, count, error = _read_header(payload[:_HEADER.size])
+    end = _HEADER.size + _SIZES[dtype] * count
+    error_end = end + (_SIZES[error_dtype] * count if error is None else 0)
+    if len(payload) != error_end:
+        raise ValueError("Payload is {} bytes, not {}".format(
+         len(payload), error_end
+        ))
+    return _build(
+     payload[_HEADER.size:end], payload[end:error_end],
+     dtype, error_dtype, error
+    )
+
+
+
+class Encoder:
+    """An Encoder writes batches of Values to a binary stream (a file, a
+    socket file, a ``BytesIO`` etc.) one payload after another, in the format
+    of :py:func:`.encode`. The header and buffers of each payload are written
+    separately, so the Values are never copied into an intermediate payload.
+
+    :param stream: The binary stream to write to."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+
+    def __repr__(self):
+        return "<Encoder>"
+
+
+    def write(self, values):
+        """Writes a batch of Values to the stream.
+
+        :param values: The Values to write.
+        :returns: The number of bytes written."""
+
+        size = 0
+        for chunk in _frame(values):
+            self._stream.write(chunk)
+            size += memoryview(chunk).nbytes
+        return size
+
+
+
+class Decoder:
+    """A Decoder reads back the batches of Values that an :py:class:`.Encoder`
+    wrote to a binary stream. Each batch is read straight into a fresh buffer
+    with ``readinto`` where the stream supports it, and that buffer becomes the
+    resulting :py:class:`.ValueArray`'s storage without further copying.
+
+    Decoders can be iterated over, giving one ValueArray per batch until the
+    stream runs out.
+
+    The buffer for a batch is allocated before it is read, so a Decoder won't
+    read a batch of more than ``max_count`` Values - that way a corrupt or
+    hostile header can't make it try to allocate more memory than there is.
+    Pass ``None`` if you trust the stream and need larger batches.
+
+    :param stream: The binary stream to read from.
+    :param int max_count: The most Values a batch can have."""
+
+    def __init__(self, stream, max_count=2 ** 24):
+        self._stream = stream
+        self._max_count = max_count
+
+
+    def __repr__(self):
+        return "<Decoder>"
+
+
+    def __iter__(self):
+        while True:
+            values = self.read()
+            if values is None: return
+            yield values
+
+
+    def read(self):
+        """Reads the next batch of Values from the stream, or returns ``None``
+        if the stream has ended.
+
+        :raises ValueError: if the stream contains an invalid or truncated\
+        payload, or a batch with more than ``max_count`` Values.
+        :rtype: :py:class:`.ValueArray`"""
+
+        header = self._read(_HEADER.size, allow_empty=True)
+        if header is None: return None
+        dtype, error_dtype, count, error = _read_header(header)
+        if self._max_count is not None and count > self._max_count:
+            raise ValueError("Batch has {} Values, more than {}".format(
+             count, self._max_count
+            ))
+        size = _SIZES[dtype] * count
+        error_size = _SIZES[error_dtype] * count if error is None else 0
+        body = memoryview(self._read(size + error_size))
+        return _build(body[:size], body[size:], dtype, error_dtype, error)
+
+
+    def _read(self, size, allow_empty=False):
+        buffer = bytearray(size)
+        view, read = memoryview(buffer), 0
+        while read < size:
+            if hasattr(self._stream, "readinto"):
+                chunk = self._stream.readinto(view[read:])
+            else:
+                data = self._stream.read(size - read)
+                view[read:read + len(data)] = data
+                chunk = len(data)
+            if not chunk:
+                if read == 0 and allow_empty: return None
+                raise ValueError("Stream ended {} bytes into {}".format(
+                 read, size
+                ))
+            read += chunk
+        return buffer
+
+
+
+def _frame(values):
+    """Returns the header and buffers of a payload, as a list of objects
+    supporting the buffer protocol."""
+
+    if not isinstance(values, ValueArray):
+        numbers, errors = _unpack(values)
+        values = ValueArray(numbers, errors)
+    error = values.shared_error()
+    header = _HEADER.pack(
+     _MAGIC, _VERSION, _CODES[values.dtype()], _CODES[values.error_dtype()],
+     error is not None, len(values), error or 0
+    )
+    buffers = [values.value_buffer()]
+    if error is None: buffers.append(values.error_buffer())
+    if sys.byteorder == "big":
+        buffers = [_swap(buffer, dtype) for buffer, dtype in zip(
+         buffers, (values.dtype(), values.error_dtype())
+        )]
+    return [header] + buffers
+
+
+def _read_header(header):
+    """Unpacks a payload header, returning the value dtype, error dtype,
+    number of Values and shared error (or ``None``)."""
+
+    if len(header) != _HEADER.size:
+        raise ValueError("Payload header is {} bytes, not {}".format(
+         len(header), _HEADER.size
+        ))
+    magic, version, code, error_code, shared, count, error = _HEADER.unpack(
+     header
+    )
+    if magic != _MAGIC:
+        raise ValueError("Payload does not start with {}".format(_MAGIC))
+    if version != _VERSION:
+        raise ValueError("Can't read version {} payloads".format(version))
+    if code not in _DTYPES or error_code not in _DTYPES:
+        raise ValueError("Payload has unknown dtype codes")
+    return _DTYPES[code], _DTYPES[error_code], count, error if shared else None
+
+
+def _build(values, errors, dtype, error_dtype, error):
+    """Makes a ValueArray from the buffers of a payload."""
+
+    if sys.byteorder == "big":
+        values, errors = _swap(values, dtype), _swap(errors, error_dtype)
+    return ValueArray.from_buffers(
+     values, errors if error is None else error,
+     dtype=dtype, error_dtype=error_dtype
+    )
+
+
+def _swap(buffer, dtype):
+    """Returns a byte-swapped copy of a buffer of the given dtype, for
+    big-endian machines."""
+
+    swapped = array(_FORMATS[dtype])
+    swapped.frombytes(memoryview(buffer).cast("B"))
+    swapped.byteswap()
+    return swapped
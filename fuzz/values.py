@@ -80,7 +80,12 @@ class Value:
         return str(self._value)
 
 
+    def __reduce__(self):
+        return (Value, (self._value, self._error))
+
+
     def __add__(self, other):
+        if not isinstance(other, (Value, int, float)): return NotImplemented
         value = self._value + (other._value if isinstance(other, Value) else other)
         error = self._error ** 2
         other_error = (other._error if isinstance(other, Value) else 0) ** 2
@@ -93,6 +98,7 @@ class Value:
 
 
     def __sub__(self, other):
+        if not isinstance(other, (Value, int, float)): return NotImplemented
         value = self._value - (other._value if isinstance(other, Value) else other)
         error = self._error ** 2
         other_error = (other._error if isinstance(other, Value) else 0) ** 2
@@ -101,6 +107,7 @@ class Value:
 
 
     def __rsub__(self, other):
+        if not isinstance(other, (Value, int, float)): return NotImplemented
         value = (other._value if isinstance(other, Value) else other) - self._value
         error = self._error ** 2
         other_error = (other._error if isinstance(other, Value) else 0) ** 2
@@ -109,6 +116,7 @@ class Value:
 
 
     def __mul__(self, other):
+        if not isinstance(other, (Value, int, float)): return NotImplemented
         value = self._value
         other_value = (other._value if isinstance(other, Value) else other)
         value *= other_value
@@ -124,6 +132,7 @@ class Value:
 
 
     def __truediv__(self, other):
+        if not isinstance(other, (Value, int, float)): return NotImplemented
         value = self._value
         other_value = (other._value if isinstance(other, Value) else other)
         value /= other_value
@@ -135,6 +144,7 @@ class Value:
 
 
     def __rtruediv__(self, other):
+        if not isinstance(other, (Value, int, float)): return NotImplemented
         value = (other._value if isinstance(other, Value) else other) / self._value
         error = self.relative_error() + (
          other.relative_error() if isinstance(other, Value) else 0
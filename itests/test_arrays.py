@@ -0,0 +1,70 @@
+from unittest import TestCase
+from fuzz import Value, ValueArray
+
+class ValueArrayTest(TestCase):
+
+    def test_arrays_match_values(self):
+        pairs = [(49.52, 0.08), (-189.53, 0.05), (120, 3), (0.88, 0.04)]
+        values = [Value(*pair) for pair in pairs]
+        array = ValueArray.from_values(values)
+        other = Value(20, 1.2)
+        for result, expected in (
+         (array + other, [value + other for value in values]),
+         (array - other, [value - other for value in values]),
+         (array * other, [value * other for value in values]),
+         (array / other, [value / other for value in values]),
+         (array ** 3, [value ** 3 for value in values]),
+        ):
+            for value, expected_value in zip(result, expected):
+                self.assertAlmostEqual(value.value(), expected_value.value())
+                self.assertAlmostEqual(value.error(), expected_value.error())
+
+
+    def test_compact_arrays_are_accurate_and_small(self):
+        values = [Value(1000 + n * 0.37, 0.01 + n * 0.0001) for n in range(1000)]
+        array = ValueArray.from_values(
+         values, dtype="float32", error_dtype="float16"
+        )
+        self.assertEqual(array.nbytes(), 6000)
+        for value, stored in zip(values, array):
+            self.assertAlmostEqual(
+             stored.value(), value.value(), delta=abs(value.value()) * 2 ** -24
+            )
+            self.assertAlmostEqual(
+             stored.error(), value.error(), delta=value.error() * 2 ** -11
+            )
+        doubled = array * 2
+        self.assertEqual(doubled.dtype(), "float32")
+        self.assertEqual(doubled.error_dtype(), "float16")
+        self.assertAlmostEqual(doubled[10].error(), values[10].error() * 2, 5)
+
+
+
+    def test_series_operations_match_values(self):
+        values = [Value(10 + n * 0.3, 0.05 + n * 0.01) for n in range(50)]
+        array = ValueArray.from_values(values)
+        total, product = values[0], values[0]
+        expected_sums, expected_products = [total], [product]
+        for value in values[1:]:
+            total, product = total + value, product * value
+            expected_sums.append(total)
+            expected_products.append(product)
+        for result, expected in (
+         (array.cumsum(), expected_sums),
+         (array.cumprod(), expected_products),
+         (array.diff(), [b - a for a, b in zip(values, values[1:])]),
+         (array.gradient(), [values[1] - values[0]] + [
+          (c - a) / 2 for a, c in zip(values, values[2:])
+         ] + [values[-1] - values[-2]]),
+         (array.resample(5), [
+          sum(values[n:n + 5], Value(0)) / 5 for n in range(0, 50, 5)
+         ]),
+        ):
+            self.assertEqual(len(result), len(expected))
+            for value, expected_value in zip(result, expected):
+                self.assertAlmostEqual(
+                 value.value() / expected_value.value(), 1
+                )
+                self.assertAlmostEqual(
+                 value.error() / expected_value.error(), 1
+                )
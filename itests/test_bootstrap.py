@@ -0,0 +1,16 @@
+from statistics import mean
+from unittest import TestCase
+from fuzz import Value, Bootstrap
+
+class BootstrapTest(TestCase):
+
+    def test_bootstrap_error_of_mean(self):
+        data = [9.8, 10.4, 10.1, 9.6, 10.2, 9.9, 10.3, 10.0, 9.7, 10.5]
+        bootstrap = Bootstrap(data, mean, resamples=4000, seed=12)
+        value = bootstrap.value()
+        self.assertIsInstance(value, Value)
+        self.assertAlmostEqual(value.value(), 10.05)
+        self.assertAlmostEqual(value.error(), 0.0908, delta=0.01)
+        low, high = bootstrap.interval(0.95)
+        self.assertLess(low, 10.05)
+        self.assertGreater(high, 10.05)
@@ -0,0 +1,17 @@
+from unittest import TestCase
+from fuzz import Value, ValueArray, CalibrationTable
+
+class CalibrationTableTest(TestCase):
+
+    def test_batch_and_single_conversions_agree(self):
+        table = CalibrationTable(
+         [0, 25, 50, 100], [Value(0.2, 0.1), Value(5.1, 0.1), 9.9, 20.3]
+        )
+        readings = ValueArray([0, 12.5, 25, 49.9, 80, 100], 0.5)
+        converted = table.convert(readings)
+        for reading, value in zip(readings, converted):
+            expected = table(reading)
+            self.assertAlmostEqual(value.value(), expected.value())
+            self.assertAlmostEqual(value.error(), expected.error())
+        self.assertAlmostEqual(converted[1].value(), 2.65)
+        self.assertAlmostEqual(converted[4].value(), 16.14)
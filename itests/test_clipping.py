@@ -0,0 +1,56 @@
+from random import Random
+from unittest import TestCase
+from fuzz import Value, ValueArray, sigma_clip, sigma_clip_groups
+
+def clip_by_hand(values, threshold=3, iterations=5):
+    kept = list(values)
+    centre = sorted(value.value() for value in kept)
+    centre = (centre[(len(centre) - 1) // 2] + centre[len(centre) // 2]) / 2
+    mean = None
+    for _ in range(iterations):
+        remaining = [value for value in kept
+         if abs(value.value() - centre) <= threshold * value.error()]
+        if len(remaining) == len(kept) and mean is not None: break
+        kept = remaining
+        weights = [1 / value.error() ** 2 for value in kept]
+        total = Value(0)
+        for value, weight in zip(kept, weights):
+            total = total + value * weight
+        mean = total / sum(weights)
+        mean = Value(mean.value(), sum(weights) ** -0.5)
+        centre = mean.value()
+    kept = set(map(id, kept))
+    return mean, [id(value) in kept for value in values]
+
+
+class SigmaClipTest(TestCase):
+
+    def setUp(self):
+        generator = Random(8)
+        self.values = [
+         Value(generator.gauss(50, 0.5), generator.uniform(0.4, 0.6))
+         for _ in range(5000)
+        ]
+        for index in range(0, 5000, 100):
+            self.values[index] = Value(50 + generator.choice((-1, 1)) * (
+             generator.uniform(5, 20)
+            ), 0.5)
+
+
+    def test_clipping_matches_loop(self):
+        mean, mask = sigma_clip(ValueArray.from_values(self.values))
+        expected_mean, expected_mask = clip_by_hand(self.values)
+        self.assertEqual(mask, expected_mask)
+        self.assertAlmostEqual(mean.value(), expected_mean.value())
+        self.assertAlmostEqual(mean.error(), expected_mean.error())
+        self.assertEqual(mask[::100], [False] * 50)
+        self.assertAlmostEqual(mean.value(), 50, delta=0.05)
+
+
+    def test_groups_are_cleaned_together(self):
+        keys = [index % 20 for index in range(5000)]
+        means, mask = sigma_clip_groups(keys, self.values)
+        self.assertEqual(len(means), 20)
+        self.assertEqual(mask[::100], [False] * 50)
+        for mean in means.values():
+            self.assertAlmostEqual(mean.value(), 50, delta=0.2)
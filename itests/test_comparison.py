@@ -0,0 +1,36 @@
+from random import Random
+from unittest import TestCase
+from fuzz import Value, ValueArray, Comparison
+
+class ComparisonTest(TestCase):
+
+    def setUp(self):
+        generator = Random(3)
+        self.batch = [Value(generator.gauss(0, 1), generator.uniform(0.05, 0.2))
+         for _ in range(300)]
+        self.catalogue = ValueArray.from_values([
+         Value(generator.gauss(0, 1), generator.uniform(0.05, 0.2))
+         for _ in range(400)
+        ])
+
+
+    def test_comparison_matches_values(self):
+        comparison = Comparison(self.batch, self.catalogue, tile_size=64)
+        pairs = list(comparison.significant(3))
+        expected = []
+        for i, a in enumerate(self.batch):
+            for j, b in enumerate(self.catalogue):
+                significance = abs(a.value() - b.value()) / (
+                 a.error() ** 2 + b.error() ** 2
+                ) ** 0.5
+                if significance >= 3: expected.append((i, j, significance))
+        self.assertEqual(len(pairs), len(expected))
+        for pair, expected_pair in zip(pairs, expected):
+            self.assertEqual(pair[:2], expected_pair[:2])
+            self.assertAlmostEqual(pair[2], expected_pair[2])
+        for row, column, _, consistencies in comparison.tiles():
+            for i, consistency in enumerate(consistencies):
+                for j, flag in enumerate(consistency):
+                    self.assertEqual(flag, self.batch[row + i].consistent_with(
+                     self.catalogue[column + j]
+                    ))
@@ -0,0 +1,46 @@
+import csv
+import io
+import json
+from unittest import TestCase
+from fuzz import Value, ValueArray, Writer
+from fuzz.export import format_values
+
+class ExportTest(TestCase):
+
+    def setUp(self):
+        self.values = [Value(1000 + n * 0.37, 0.01 + n * 0.001)
+         for n in range(20000)]
+
+
+    def test_exported_values_are_rounded_to_their_errors(self):
+        stream = io.StringIO()
+        Writer(stream, chunk_size=3000).write(
+         self.values, labels=("row {}".format(n) for n in range(20000))
+        )
+        stream.seek(0)
+        rows = list(csv.DictReader(stream))
+        self.assertEqual(len(rows), 20000)
+        for value, row in zip(self.values, rows):
+            error = float(row["error"])
+            self.assertAlmostEqual(error, value.error(), delta=error * 0.05)
+            self.assertAlmostEqual(
+             float(row["value"]), value.value(), delta=error * 0.05
+            )
+            self.assertEqual(len(row["error"].replace(".", "").lstrip("0")), 2)
+
+
+    def test_json_lines_are_valid(self):
+        stream = io.StringIO()
+        Writer(stream, "jsonl").write(ValueArray.from_values(self.values[:100]))
+        for line, value in zip(stream.getvalue().splitlines(), self.values):
+            row = json.loads(line)
+            self.assertAlmostEqual(row["value"], value.value(), delta=0.001)
+
+
+    def test_formatted_values_match_exported_rows(self):
+        stream = io.StringIO()
+        Writer(stream, header=False).write(self.values)
+        self.assertEqual(format_values(self.values), [
+         "{} ± {}".format(*line.split(","))
+         for line in stream.getvalue().splitlines()
+        ])
@@ -0,0 +1,25 @@
+from unittest import TestCase
+from fuzz import Value, GroupBy
+
+class GroupByTest(TestCase):
+
+    def test_group_reductions_match_values(self):
+        records = [
+         ("run2", Value(4.1, 0.2)), ("run1", Value(3.9, 0.1)),
+         ("run2", Value(4.4, 0.3)), ("run1", Value(4.0, 0.2)),
+         ("run1", Value(3.8, 0.1)),
+        ]
+        totals = {}
+        for key, value in records:
+            totals[key] = totals[key] + value if key in totals else value
+        groups = GroupBy(*zip(*records))
+        sums = groups.sum()
+        self.assertEqual(list(sums), ["run2", "run1"])
+        for key in totals:
+            self.assertAlmostEqual(sums[key].value(), totals[key].value())
+            self.assertAlmostEqual(sums[key].error(), totals[key].error())
+        means = groups.weighted_mean()
+        self.assertAlmostEqual(means["run1"].value(), 3.8667, delta=0.00005)
+        self.assertAlmostEqual(means["run1"].error(), 0.0667, delta=0.00005)
+        self.assertEqual(groups.consistent(), {"run1": True, "run2": True})
+        self.assertEqual(groups.max()["run2"].value(), 4.4)
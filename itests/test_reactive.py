@@ -0,0 +1,16 @@
+from unittest import TestCase
+from fuzz import Value, Node
+
+class NodeTest(TestCase):
+
+    def test_derived_nodes_follow_their_inputs(self):
+        mass, volume = Node(49.52, 0.08), Node(20, 1.2)
+        density = mass / volume
+        scaled = density * 1000
+        self.assertAlmostEqual(
+         density.get().value(), (Value(49.52, 0.08) / Value(20, 1.2)).value()
+        )
+        volume.set(-189.53, 0.05)
+        expected = Value(49.52, 0.08) / Value(-189.53, 0.05) * 1000
+        self.assertAlmostEqual(scaled.get().value(), expected.value())
+        self.assertAlmostEqual(scaled.get().error(), expected.error())
@@ -0,0 +1,23 @@
+import pickle
+from unittest import TestCase
+from fuzz import Value, ValueArray
+from fuzz.serialization import encode, decode
+
+class SerializationTest(TestCase):
+
+    def setUp(self):
+        self.values = [Value(n * 0.37, 0.01 + n * 0.0001) for n in range(20000)]
+        self.array = ValueArray.from_values(self.values)
+
+
+    def test_payloads_round_trip_and_are_compact(self):
+        payload = encode(self.values)
+        decoded = decode(payload)
+        for value, copy in zip(self.values, decoded):
+            self.assertEqual(value.value(), copy.value())
+            self.assertEqual(value.error(), copy.error())
+        self.assertEqual(len(payload), 24 + 16 * len(self.values))
+        self.assertLess(len(payload), len(pickle.dumps(self.values)))
+        decoded = decode(encode(self.array))
+        self.assertEqual(decoded.values(), self.array.values())
+        self.assertEqual(decoded.errors(), self.array.errors())
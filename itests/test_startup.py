@@ -0,0 +1,67 @@
+import compileall
+import os
+import subprocess
+import sys
+from unittest import TestCase
+import fuzz
+
+IMPORT_TIME_BUDGET = 0.02
+IMPORT_MEMORY_BUDGET = 512 * 1024
+HEAVY_MODULES = [
+ "numpy", "pandas", "multiprocessing", "concurrent.futures", "statistics",
+ "fuzz.arrays", "fuzz.bootstrap",
+]
+
+def run(script):
+    path = os.path.dirname(os.path.dirname(os.path.abspath(fuzz.__file__)))
+    environment = dict(os.environ, PYTHONPATH=path)
+    return subprocess.check_output(
+     [sys.executable, "-c", script], env=environment, universal_newlines=True
+    ).split()
+
+
+class StartupTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Compiling fuzz is far slower and uses far more memory than importing
+        # it, so make sure the imports below read bytecode that already exists
+        compileall.compile_dir(os.path.dirname(fuzz.__file__), quiet=1)
+
+
+    def test_import_is_within_time_budget(self):
+        times = [float(run(
+         "import time\n"
+         "start = time.perf_counter()\n"
+         "import fuzz\n"
+         "print(time.perf_counter() - start)"
+        )[0]) for _ in range(5)]
+        self.assertLess(min(times), IMPORT_TIME_BUDGET)
+
+
+    def test_import_is_within_memory_budget(self):
+        peak = int(run(
+         "import tracemalloc\n"
+         "tracemalloc.start()\n"
+         "import fuzz\n"
+         "print(tracemalloc.get_traced_memory()[1])"
+        )[0])
+        self.assertLess(peak, IMPORT_MEMORY_BUDGET)
+
+
+    def test_import_does_not_load_heavy_modules(self):
+        modules = run("import sys, fuzz\nprint(' '.join(sys.modules))")
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, modules)
+        modules = run(
+         "import sys, fuzz\nfuzz.Value(1)\nprint(' '.join(sys.modules))"
+        )
+        self.assertNotIn("fuzz.arrays", modules)
+
+
+    def test_other_classes_are_loaded_when_used(self):
+        from fuzz.bootstrap import Bootstrap
+        self.assertIs(fuzz.Bootstrap, Bootstrap)
+        self.assertIn("ValueArray", dir(fuzz))
+        with self.assertRaises(AttributeError):
+            fuzz.Missing
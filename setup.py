@@ -14,14 +14,13 @@ setup(
   "License :: OSI Approved :: MIT License",
   "Topic :: Scientific/Engineering :: Chemistry",
   "Programming Language :: Python :: 3",
-  "Programming Language :: Python :: 3.0",
-  "Programming Language :: Python :: 3.1",
-  "Programming Language :: Python :: 3.2",
-  "Programming Language :: Python :: 3.3",
-  "Programming Language :: Python :: 3.4",
-  "Programming Language :: Python :: 3.5",
-  "Programming Language :: Python :: 3.6",
+  "Programming Language :: Python :: 3.8",
+  "Programming Language :: Python :: 3.9",
+  "Programming Language :: Python :: 3.10",
+  "Programming Language :: Python :: 3.11",
+  "Programming Language :: Python :: 3.12",
  ],
  keywords="statistics measurements unertainty propagation",
  packages=["fuzz"],
+ python_requires=">=3.8",
 )
@@ -0,0 +1,633 @@
+import pickle
+import struct
+import sys
+from array import array as Array
+from unittest import TestCase
+from unittest.mock import patch
+from fuzz.arrays import ValueArray
+from fuzz.values import Value
+
+class ValueArrayCreationTests(TestCase):
+
+    def test_can_create_value_array(self):
+        array = ValueArray([1, 2.5, 3], [0.1, 0.2, 0.3])
+        self.assertEqual(array._values.tolist(), [1, 2.5, 3])
+        self.assertEqual(array._errors.tolist(), [0.1, 0.2, 0.3])
+        self.assertIsNone(array._error)
+        self.assertEqual(array._dtype, "float64")
+        self.assertEqual(array._error_dtype, "float64")
+
+
+    def test_can_create_value_array_with_shared_error(self):
+        array = ValueArray([1, 2.5, 3], 0.5)
+        self.assertIsNone(array._errors)
+        self.assertEqual(array._error, 0.5)
+
+
+    def test_error_defaults_to_zero(self):
+        array = ValueArray([1, 2.5, 3])
+        self.assertIsNone(array._errors)
+        self.assertEqual(array._error, 0)
+
+
+    def test_can_set_dtypes(self):
+        array = ValueArray([1.1, 2], [0.1, 0.2], dtype="float32")
+        self.assertEqual(array._values.typecode, "f")
+        self.assertEqual(array._errors.typecode, "f")
+        array = ValueArray(
+         [1.1, 2], [0.1, 0.2], dtype="float32", error_dtype="float16"
+        )
+        self.assertEqual(array._values.typecode, "f")
+        self.assertEqual(array._errors.typecode, "H")
+        self.assertEqual(array._error_dtype, "float16")
+
+
+    def test_dtypes_must_be_supported(self):
+        with self.assertRaises(ValueError):
+            ValueArray([1, 2], dtype="float8")
+        with self.assertRaises(ValueError):
+            ValueArray([1, 2], error_dtype="int32")
+
+
+    def test_values_and_errors_must_be_numbers(self):
+        with self.assertRaises(TypeError):
+            ValueArray(["1", 2])
+        with self.assertRaises(TypeError):
+            ValueArray([1, 2], [0.1, "0.2"])
+        with self.assertRaises(TypeError):
+            ValueArray([1, 2], True)
+
+
+    def test_values_and_errors_cant_be_bools(self):
+        for dtype in ("float64", "float32", "float16"):
+            with self.assertRaises(TypeError):
+                ValueArray([True, False], dtype=dtype)
+            with self.assertRaises(TypeError):
+                ValueArray((1, 2), [True, 0.1], dtype=dtype)
+            with self.assertRaises(TypeError):
+                ValueArray(iter([1, True]), dtype=dtype)
+
+
+    def test_errors_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            ValueArray([1, 2], [0.1, -0.2])
+        with self.assertRaises(ValueError):
+            ValueArray([1, 2], -0.2)
+
+
+    def test_errors_must_match_values(self):
+        with self.assertRaises(ValueError):
+            ValueArray([1, 2], [0.1, 0.2, 0.3])
+
+
+    def test_float16_overflow(self):
+        with self.assertRaises(OverflowError):
+            ValueArray([1, 2], [0.1, 100000], error_dtype="float16")
+
+
+
+class ValueArrayFromValuesTests(TestCase):
+
+    def test_can_create_from_values(self):
+        array = ValueArray.from_values([Value(1, 0.1), 2, Value(3, 0.3)])
+        self.assertEqual(array._values.tolist(), [1, 2, 3])
+        self.assertEqual(array._errors.tolist(), [0.1, 0, 0.3])
+
+
+    def test_can_create_from_values_with_dtypes(self):
+        array = ValueArray.from_values(
+         [Value(1, 0.1)], dtype="float32", error_dtype="float16"
+        )
+        self.assertEqual(array._dtype, "float32")
+        self.assertEqual(array._error_dtype, "float16")
+
+
+
+class ValueArrayFromBuffersTests(TestCase):
+
+    def test_can_create_from_buffers_without_copying(self):
+        values, errors = Array("d", [1, 2, 3]), Array("f", [0.5, 0.25, 0])
+        array = ValueArray.from_buffers(values, errors)
+        self.assertEqual(array._dtype, "float64")
+        self.assertEqual(array._error_dtype, "float32")
+        self.assertIsNone(array._error)
+        values[0], errors[0] = 10, 1.5
+        self.assertEqual(array.values(), [10, 2, 3])
+        self.assertEqual(array.errors(), [1.5, 0.25, 0])
+
+
+    def test_can_create_from_buffers_with_shared_error(self):
+        array = ValueArray.from_buffers(Array("f", [1, 2]), 0.5)
+        self.assertIsNone(array._errors)
+        self.assertEqual(array._error, 0.5)
+        self.assertEqual(array._error_dtype, "float32")
+        array = ValueArray.from_buffers(
+         Array("f", [1, 2]), 0.1, error_dtype="float16"
+        )
+        self.assertEqual(array._error, 0.0999755859375)
+
+
+    def test_can_create_from_untyped_buffers(self):
+        values = bytearray(struct.pack("2e", 1.5, 2.5))
+        errors = bytes(struct.pack("2d", 0.5, 0.25))
+        array = ValueArray.from_buffers(
+         values, errors, dtype="float16", error_dtype="float64"
+        )
+        self.assertEqual(array.values(), [1.5, 2.5])
+        self.assertEqual(array.errors(), [0.5, 0.25])
+        with self.assertRaises(TypeError):
+            ValueArray.from_buffers(values)
+
+
+    def test_buffers_must_match_dtypes(self):
+        with self.assertRaises(ValueError):
+            ValueArray.from_buffers(Array("d", [1, 2]), dtype="float32")
+        with self.assertRaises(ValueError):
+            ValueArray.from_buffers(Array("d", [1, 2]), dtype="float128")
+        with self.assertRaises(TypeError):
+            ValueArray.from_buffers(Array("i", [1, 2]))
+        with self.assertRaises(TypeError):
+            ValueArray.from_buffers([1, 2])
+        with self.assertRaises(TypeError):
+            ValueArray.from_buffers(memoryview(Array("d", [1, 2, 3]))[::2])
+
+
+    def test_buffer_errors_are_checked(self):
+        with self.assertRaises(ValueError):
+            ValueArray.from_buffers(Array("d", [1, 2]), Array("d", [1]))
+        with self.assertRaises(ValueError):
+            ValueArray.from_buffers(Array("d", [1, 2]), Array("d", [1, -1]))
+        with self.assertRaises(ValueError):
+            ValueArray.from_buffers(
+             Array("d", [1]), struct.pack("e", -1), error_dtype="float16"
+            )
+        with self.assertRaises(ValueError):
+            ValueArray.from_buffers(Array("d", [1, 2]), -1)
+
+
+    def test_buffer_arrays_can_be_used_like_any_other(self):
+        array = ValueArray.from_buffers(
+         Array("d", [1, 2, 3]), Array("d", [1, 1, 1])
+        )
+        self.assertEqual(array[1:].values(), [2, 3])
+        self.assertEqual(array[1]._value, 2)
+        self.assertEqual((array + 1).values(), [2, 3, 4])
+        self.assertEqual(array.nbytes(), 48)
+
+
+
+class ValueArrayReprTests(TestCase):
+
+    def test_repr(self):
+        self.assertEqual(repr(ValueArray([1, 2, 3])), "<ValueArray (3 Values)>")
+
+
+
+class ValueArrayContainerTests(TestCase):
+
+    def test_length(self):
+        self.assertEqual(len(ValueArray([1, 2, 3], 0.1)), 3)
+
+
+    def test_can_get_value(self):
+        array = ValueArray([1, 2, 3], [0.25, 0.5, 0.75], error_dtype="float16")
+        value = array[1]
+        self.assertIsInstance(value, Value)
+        self.assertEqual(value._value, 2)
+        self.assertEqual(value._error, 0.5)
+        self.assertEqual(array[-1]._error, 0.75)
+        with self.assertRaises(IndexError):
+            array[3]
+
+
+    def test_can_get_value_with_shared_error(self):
+        value = ValueArray([1, 2, 3], 0.5)[2]
+        self.assertEqual(value._value, 3)
+        self.assertEqual(value._error, 0.5)
+
+
+    def test_can_slice(self):
+        array = ValueArray([1, 2, 3], [0.25, 0.5, 0.75], dtype="float32")[1:]
+        self.assertIsInstance(array, ValueArray)
+        self.assertEqual(array._values.tolist(), [2, 3])
+        self.assertEqual(array._errors.tolist(), [0.5, 0.75])
+        self.assertEqual(array._dtype, "float32")
+        array = ValueArray([1, 2, 3], 0.5)[:1]
+        self.assertEqual(array._values.tolist(), [1])
+        self.assertEqual(array._error, 0.5)
+
+
+    def test_can_step_slice_buffers(self):
+        for dtype in ("float64", "float32", "float16"):
+            array = ValueArray.from_buffers(
+             ValueArray([1, 2, 3, 4, 5], dtype=dtype).value_buffer(),
+             ValueArray([0.5, 1, 1.5, 2, 2.5], dtype=dtype).value_buffer(),
+             dtype=dtype, error_dtype=dtype
+            )
+            for index, values in ((slice(None, None, 2), [1, 3, 5]),
+             (slice(None, None, -2), [5, 3, 1]), (slice(1, None, 3), [2, 5])):
+                sliced = array[index]
+                self.assertNotIsInstance(sliced._values, memoryview)
+                self.assertEqual(sliced.values(), values)
+                self.assertEqual(sliced.errors(), [v / 2 for v in values])
+                self.assertEqual([v._value for v in sliced], values)
+                copy = ValueArray.from_buffers(
+                 sliced.value_buffer(), sliced.error_buffer(),
+                 dtype=dtype, error_dtype=dtype
+                )
+                self.assertEqual(copy.values(), values)
+            self.assertIsInstance(array[1:3]._values, memoryview)
+
+
+    def test_can_iterate(self):
+        values = list(ValueArray([1, 2], [0.1, 0.2]))
+        self.assertEqual([v._value for v in values], [1, 2])
+        self.assertEqual([v._error for v in values], [0.1, 0.2])
+
+
+
+class ValueArrayArithmeticTests(TestCase):
+
+    def test_can_add_arrays(self):
+        array = ValueArray([1, 2], [3, 0.5]) + ValueArray([10, 20], [4, 1.2])
+        self.assertEqual(array.values(), [11, 22])
+        self.assertEqual(array.errors()[0], 5)
+        self.assertAlmostEqual(array.errors()[1], 1.3)
+
+
+    def test_adding_shared_errors_keeps_them_shared(self):
+        array = ValueArray([1, 2], 3) + ValueArray([10, 20], 4)
+        self.assertIsNone(array._errors)
+        self.assertEqual(array._error, 5)
+        array = ValueArray([1, 2], 3) + Value(10, 4)
+        self.assertEqual(array._error, 5)
+        array = 10 + ValueArray([1, 2], 3)
+        self.assertEqual(array.values(), [11, 12])
+        self.assertEqual(array._error, 3)
+
+
+    def test_can_add_value_to_array(self):
+        array = Value(10, 4) + ValueArray([1, 2], [3, 0])
+        self.assertIsInstance(array, ValueArray)
+        self.assertEqual(array.values(), [11, 12])
+        self.assertEqual(array.errors(), [5, 4])
+
+
+    def test_can_subtract(self):
+        array = ValueArray([1, 2], [3, 0]) - ValueArray([10, 20], [4, 1])
+        self.assertEqual(array.values(), [-9, -18])
+        self.assertEqual(array.errors(), [5, 1])
+        array = 10 - ValueArray([1, 2], 3)
+        self.assertEqual(array.values(), [9, 8])
+        self.assertEqual(array._error, 3)
+        array = Value(10, 4) - ValueArray([1, 2], 3)
+        self.assertEqual(array.values(), [9, 8])
+        self.assertEqual(array._error, 5)
+
+
+    def test_can_multiply(self):
+        array = ValueArray([2, -2], [0.05, 0.05]) * ValueArray([3, 3], 0.18)
+        self.assertEqual(array.values(), [6, -6])
+        self.assertAlmostEqual(array.errors()[0], 0.39)
+        self.assertAlmostEqual(array.errors()[1], 0.39)
+        array = 3 * ValueArray([2, 0], [0.08, 1])
+        self.assertEqual(array.values(), [6, 0])
+        self.assertAlmostEqual(array.errors()[0], 0.24)
+        self.assertEqual(array.errors()[1], 0)
+
+
+    def test_can_divide(self):
+        array = ValueArray([12, 12], [48, 48]) / ValueArray([4, -4], [12, 12])
+        self.assertEqual(array.values(), [3, -3])
+        self.assertEqual(array.errors(), [15, 15])
+        array = 12 / ValueArray([4], [0.24])
+        self.assertEqual(array.values(), [3])
+        self.assertAlmostEqual(array.errors()[0], 0.18)
+        with self.assertRaises(ZeroDivisionError):
+            ValueArray([1, 2]) / ValueArray([1, 0])
+
+
+    def test_can_raise_to_power(self):
+        array = ValueArray([2, -2], [0.02, 0.02]) ** 3
+        self.assertEqual(array.values(), [8, -8])
+        self.assertAlmostEqual(array.errors()[0], 0.24)
+        self.assertAlmostEqual(array.errors()[1], 0.24)
+
+
+    def test_lengths_must_match(self):
+        with self.assertRaises(ValueError):
+            ValueArray([1, 2]) + ValueArray([1, 2, 3])
+
+
+    def test_cannot_combine_with_other_objects(self):
+        with self.assertRaises(TypeError):
+            ValueArray([1, 2]) + "2"
+        with self.assertRaises(TypeError):
+            ValueArray([1, 2]) ** ValueArray([1, 2])
+
+
+    def test_arithmetic_promotes_dtypes(self):
+        array = ValueArray([1], [0.1], dtype="float32", error_dtype="float16")
+        result = array + ValueArray([1], [0.1], error_dtype="float32")
+        self.assertEqual(result._dtype, "float64")
+        self.assertEqual(result._error_dtype, "float32")
+        result = array * 2
+        self.assertEqual(result._dtype, "float32")
+        self.assertEqual(result._error_dtype, "float16")
+
+
+
+class ValueArrayAccessTests(TestCase):
+
+    def test_can_get_values_and_errors(self):
+        array = ValueArray([1, 2], [0.5, 0.25], error_dtype="float16")
+        self.assertEqual(array.values(), [1, 2])
+        self.assertEqual(array.errors(), [0.5, 0.25])
+        self.assertEqual(ValueArray([1, 2], 0.5).errors(), [0.5, 0.5])
+
+
+    def test_can_get_shared_error(self):
+        self.assertEqual(ValueArray([1, 2], 0.5).shared_error(), 0.5)
+        self.assertIsNone(ValueArray([1, 2], [0.5, 0.5]).shared_error())
+
+
+    def test_can_get_dtypes(self):
+        array = ValueArray([1], dtype="float32", error_dtype="float16")
+        self.assertEqual(array.dtype(), "float32")
+        self.assertEqual(array.error_dtype(), "float16")
+
+
+    def test_can_get_size(self):
+        self.assertEqual(ValueArray([1, 2], [0.1, 0.2]).nbytes(), 32)
+        self.assertEqual(ValueArray(
+         [1, 2], [0.1, 0.2], dtype="float32", error_dtype="float16"
+        ).nbytes(), 12)
+        self.assertEqual(ValueArray([1, 2], 0.1, dtype="float32").nbytes(), 8)
+
+
+
+class ValueArrayBufferTests(TestCase):
+
+    def test_can_get_value_buffer(self):
+        array = ValueArray([1, 2], dtype="float32")
+        buffer = array.value_buffer()
+        self.assertEqual(buffer.format, "f")
+        self.assertTrue(buffer.readonly)
+        self.assertEqual(buffer.tolist(), [1, 2])
+        self.assertIs(buffer.obj, array._values)
+
+
+    def test_can_get_float16_buffer(self):
+        buffer = ValueArray([1.5, 2], dtype="float16").value_buffer()
+        self.assertEqual(buffer.format, "H")
+        self.assertEqual(struct.unpack("2e", buffer), (1.5, 2))
+
+
+    def test_can_get_error_buffer(self):
+        array = ValueArray([1, 2], [0.5, 0.25])
+        buffer = array.error_buffer()
+        self.assertTrue(buffer.readonly)
+        self.assertEqual(buffer.tolist(), [0.5, 0.25])
+        self.assertIs(buffer.obj, array._errors)
+
+
+    def test_can_get_shared_error_buffer(self):
+        buffer = ValueArray([1, 2], 0.5, error_dtype="float32").error_buffer()
+        self.assertEqual(buffer.format, "f")
+        self.assertEqual(buffer.tolist(), [0.5, 0.5])
+
+
+    def test_buffers_round_trip(self):
+        array = ValueArray([1, 2], [0.5, 0.25], error_dtype="float16")
+        copy = ValueArray.from_buffers(
+         array.value_buffer(), array.error_buffer(), error_dtype="float16"
+        )
+        self.assertEqual(copy.values(), [1, 2])
+        self.assertEqual(copy.errors(), [0.5, 0.25])
+
+
+    def test_array_interface(self):
+        array = ValueArray([1, 2], dtype="float16")
+        interface = array.__array_interface__
+        self.assertEqual(interface["version"], 3)
+        self.assertEqual(interface["shape"], (2,))
+        self.assertEqual(
+         interface["typestr"], "<f2" if sys.byteorder == "little" else ">f2"
+        )
+        self.assertEqual(interface["data"].tolist(), array._values.tolist())
+        self.assertEqual(
+         ValueArray([1]).__array_interface__["typestr"][1:], "f8"
+        )
+
+
+    def test_buffer_protocol(self):
+        array = ValueArray([1, 2])
+        self.assertEqual(array.__buffer__(0).tolist(), [1, 2])
+        if sys.version_info >= (3, 12):
+            self.assertEqual(memoryview(array).tolist(), [1, 2])
+
+
+
+class ValueArraySortingTests(TestCase):
+
+    def setUp(self):
+        self.array = ValueArray([3, -1, 2, 5], [0.5, 4, 0.2, 0.5])
+
+
+    def test_can_argsort(self):
+        self.assertEqual(self.array.argsort(), [1, 2, 0, 3])
+        self.assertEqual(self.array.argsort(reverse=True), [3, 0, 2, 1])
+
+
+    def test_can_argsort_by_other_quantities(self):
+        self.assertEqual(self.array.argsort(by="error"), [2, 0, 3, 1])
+        self.assertEqual(self.array.argsort(by="relative_error"), [2, 3, 0, 1])
+        self.assertEqual(self.array.argsort(by="lower"), [1, 2, 0, 3])
+        self.assertEqual(self.array.argsort(by="upper"), [2, 1, 0, 3])
+        with self.assertRaises(ValueError):
+            self.array.argsort(by="size")
+
+
+    def test_argsort_is_stable(self):
+        array = ValueArray([2, 1, 2, 1], [1, 2, 3, 4])
+        self.assertEqual(array.argsort(), [1, 3, 0, 2])
+        self.assertEqual(array.argsort(reverse=True), [0, 2, 1, 3])
+
+
+    def test_can_sort(self):
+        array = self.array.sort()
+        self.assertEqual(array.values(), [-1, 2, 3, 5])
+        self.assertEqual(array.errors(), [4, 0.2, 0.5, 0.5])
+        array = ValueArray([2, 1], 0.5, dtype="float32").sort(reverse=True)
+        self.assertEqual(array.values(), [2, 1])
+        self.assertEqual(array._error, 0.5)
+        self.assertEqual(array._dtype, "float32")
+
+
+    def test_can_rank(self):
+        self.assertEqual(self.array.rank(), [2, 0, 1, 3])
+        self.assertEqual(self.array.rank(by="error"), [1, 3, 0, 2])
+        self.assertEqual(ValueArray([]).rank(), [])
+
+
+    def test_can_get_top_values(self):
+        array = self.array.top(2)
+        self.assertEqual(array.values(), [5, 3])
+        self.assertEqual(array.errors(), [0.5, 0.5])
+        self.assertEqual(self.array.top(2, largest=False).values(), [-1, 2])
+        self.assertEqual(self.array.top(1, by="error").values(), [-1])
+        self.assertEqual(len(self.array.top(10)), 4)
+
+
+
+class ValueArraySearchTests(TestCase):
+
+    def test_can_search_sorted_array(self):
+        array = ValueArray([1, 2, 2, 4], 0.5)
+        self.assertEqual(array.searchsorted(2), 1)
+        self.assertEqual(array.searchsorted(2, side="right"), 3)
+        self.assertEqual(array.searchsorted(Value(3, 10)), 3)
+        self.assertEqual(array.searchsorted(0), 0)
+        self.assertEqual(array.searchsorted(5), 4)
+
+
+    def test_can_search_for_many_values(self):
+        array = ValueArray([1, 2, 2, 4], dtype="float16")
+        self.assertEqual(array.searchsorted([0, 2, Value(4)]), [0, 1, 3])
+        self.assertEqual(array.searchsorted((2, 4), side="right"), [3, 4])
+
+
+    def test_float16_search_does_not_decode_array(self):
+        array = ValueArray(range(1000), dtype="float16")
+        with patch("fuzz.arrays._decode") as mock_decode:
+            self.assertEqual(array.searchsorted(500.5), 501)
+            self.assertEqual(
+             array.searchsorted([10, 999], side="right"), [11, 1000]
+            )
+        self.assertFalse(mock_decode.called)
+
+
+    def test_side_must_be_valid(self):
+        with self.assertRaises(ValueError):
+            ValueArray([1, 2]).searchsorted(1, side="middle")
+
+
+
+class ValueArraySeriesTests(TestCase):
+
+    def setUp(self):
+        self.array = ValueArray(
+         [1, 3, 6, 10], [0.1, 0.2, 0.3, 0.4], dtype="float32"
+        )
+
+
+    def check(self, array, values, errors):
+        self.assertEqual(len(array), len(values))
+        for value, expected_value, expected_error in zip(array, values, errors):
+            self.assertAlmostEqual(value.value(), expected_value, 5)
+            self.assertAlmostEqual(value.error(), expected_error, 5)
+
+
+    def test_can_get_cumulative_sums(self):
+        cumsum = self.array.cumsum()
+        self.assertEqual(cumsum.dtype(), "float32")
+        self.check(cumsum, [1, 4, 10, 20], [
+         0.1, 0.05 ** 0.5, 0.14 ** 0.5, 0.3 ** 0.5
+        ])
+        self.check(ValueArray([1, 2, 3, 4], 0.5).cumsum(), [1, 3, 6, 10], [
+         0.5, 0.5 * 2 ** 0.5, 0.5 * 3 ** 0.5, 1
+        ])
+        self.assertEqual(len(ValueArray([]).cumsum()), 0)
+
+
+    def test_can_get_cumulative_products(self):
+        self.check(self.array.cumprod(), [1, 3, 18, 180], [
+         0.1, 3 * (0.01 + (0.2 / 3) ** 2) ** 0.5,
+         18 * (0.01 + (0.2 / 3) ** 2 + 0.05 ** 2) ** 0.5,
+         180 * (0.01 + (0.2 / 3) ** 2 + 0.05 ** 2 + 0.04 ** 2) ** 0.5
+        ])
+        self.check(ValueArray([2, 0, 3], 0.5).cumprod(), [2, 0, 0], [
+         0.5, 0, 0
+        ])
+
+
+    def test_can_get_differences(self):
+        self.check(self.array.diff(), [2, 3, 4], [
+         0.05 ** 0.5, 0.13 ** 0.5, 0.5
+        ])
+        diff = ValueArray([1, 3, 6], 0.5).diff()
+        self.assertAlmostEqual(diff.shared_error(), 0.5 * 2 ** 0.5)
+        self.assertEqual(len(ValueArray([1]).diff()), 0)
+
+
+    def test_can_get_gradient(self):
+        self.check(self.array.gradient(), [2, 2.5, 3.5, 4], [
+         0.05 ** 0.5, 0.1 ** 0.5 / 2, 0.2 ** 0.5 / 2, 0.5
+        ])
+        self.check(self.array.gradient(-2), [-1, -1.25, -1.75, -2], [
+         0.05 ** 0.5 / 2, 0.1 ** 0.5 / 4, 0.2 ** 0.5 / 4, 0.25
+        ])
+        self.check(ValueArray([1, 3]).gradient(), [2, 2], [0, 0])
+
+
+    def test_gradient_needs_two_values_and_spacing(self):
+        with self.assertRaises(ValueError):
+            ValueArray([1]).gradient()
+        with self.assertRaises(ValueError):
+            self.array.gradient(0)
+
+
+    def test_can_resample(self):
+        self.check(self.array.resample(2), [2, 8], [
+         0.05 ** 0.5 / 2, 0.25 ** 0.5 / 2
+        ])
+        self.check(self.array.resample(3), [10 / 3, 10], [0.14 ** 0.5 / 3, 0.4])
+        self.check(self.array.resample(1), [1, 3, 6, 10], [0.1, 0.2, 0.3, 0.4])
+
+
+    def test_resampling_can_keep_shared_error(self):
+        resampled = ValueArray([1, 2, 3, 4], 0.2).resample(2)
+        self.assertAlmostEqual(resampled.shared_error(), 0.2 / 2 ** 0.5)
+        resampled = ValueArray([1, 2, 3, 4, 5], 0.2).resample(2)
+        self.assertIsNone(resampled.shared_error())
+        self.check(resampled, [1.5, 3.5, 5], [0.2 / 2 ** 0.5] * 2 + [0.2])
+
+
+    def test_block_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            self.array.resample(0)
+
+
+
+class ValueArrayPicklingTests(TestCase):
+
+    def test_can_pickle_array(self):
+        array = ValueArray([1, 2], [0.5, 0.25], error_dtype="float16")
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(array, protocol=protocol))
+            self.assertEqual(copy.values(), [1, 2])
+            self.assertEqual(copy.errors(), [0.5, 0.25])
+            self.assertEqual(copy.error_dtype(), "float16")
+
+
+    def test_can_pickle_shared_error_array(self):
+        copy = pickle.loads(pickle.dumps(ValueArray([1, 2], 0.5)))
+        self.assertIsNone(copy._errors)
+        self.assertEqual(copy._error, 0.5)
+
+
+    def test_can_pickle_strided_array(self):
+        array = ValueArray.from_buffers(Array("d", [1, 2, 3]))[::2]
+        copy = pickle.loads(pickle.dumps(array, protocol=5))
+        self.assertEqual(copy.values(), [1, 3])
+
+
+    def test_buffers_can_be_pickled_out_of_band(self):
+        array = ValueArray([1, 2], [0.5, 0.25])
+        buffers = []
+        data = pickle.dumps(array, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 2)
+        self.assertLess(len(data), 100)
+        copy = pickle.loads(data, buffers=buffers)
+        self.assertEqual(copy.values(), [1, 2])
+        self.assertEqual(copy.errors(), [0.5, 0.25])
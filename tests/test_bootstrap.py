@@ -0,0 +1,135 @@
+from statistics import mean, median
+from unittest import TestCase
+from unittest.mock import patch
+from fuzz.arrays import ValueArray
+from fuzz.bootstrap import Bootstrap, _percentile, _resample, _run_block
+from fuzz.bootstrap import _worker
+from fuzz.values import Value
+
+class BootstrapCreationTests(TestCase):
+
+    def test_can_create_bootstrap(self):
+        bootstrap = Bootstrap([1, 2, 3, 4], mean, resamples=100, seed=1)
+        self.assertEqual(bootstrap._value, 2.5)
+        self.assertEqual(len(bootstrap._estimates), 100)
+        for estimate in bootstrap._estimates:
+            self.assertGreaterEqual(estimate, 1)
+            self.assertLessEqual(estimate, 4)
+
+
+    def test_bootstraps_can_be_nested(self):
+        def statistic(data):
+            return Bootstrap(data, mean, resamples=5, seed=2).value().value()
+        bootstrap = Bootstrap([1, 2, 3, 4], statistic, resamples=10, seed=1)
+        self.assertEqual(len(bootstrap._estimates), 10)
+
+
+    @patch("fuzz.bootstrap._resample")
+    def test_large_datasets_have_smaller_blocks(self, mock_resample):
+        mock_resample.side_effect = lambda block, data, statistic: [0] * block[2]
+        Bootstrap(range(10000), sum, resamples=20, seed=1)
+        self.assertEqual(
+         [call[0][0][2] for call in mock_resample.call_args_list], [6, 6, 6, 2]
+        )
+
+
+    def test_bootstrap_is_deterministic(self):
+        bootstrap1 = Bootstrap(range(20), median, resamples=200, seed=5)
+        bootstrap2 = Bootstrap(range(20), median, resamples=200, seed=5)
+        bootstrap3 = Bootstrap(range(20), median, resamples=200, seed=6)
+        self.assertEqual(bootstrap1._estimates, bootstrap2._estimates)
+        self.assertNotEqual(bootstrap1._estimates, bootstrap3._estimates)
+
+
+    def test_processes_dont_change_results(self):
+        bootstrap1 = Bootstrap(range(20), median, resamples=300, seed=5)
+        bootstrap2 = Bootstrap(
+         range(20), median, resamples=300, seed=5, processes=2
+        )
+        self.assertEqual(bootstrap1._estimates, bootstrap2._estimates)
+
+
+    @patch("fuzz.bootstrap.randrange")
+    def test_seed_is_random_by_default(self, mock_randrange):
+        mock_randrange.return_value = 5
+        bootstrap1 = Bootstrap(range(20), median, resamples=200)
+        bootstrap2 = Bootstrap(range(20), median, resamples=200, seed=5)
+        self.assertEqual(bootstrap1._estimates, bootstrap2._estimates)
+
+
+    def test_can_bootstrap_values(self):
+        data = ValueArray([1, 2, 3, 4, 5], 0.5)
+        bootstrap = Bootstrap(data, median, resamples=10, seed=1)
+        self.assertEqual(bootstrap._value, 3)
+        for estimate in bootstrap._estimates:
+            self.assertNotIsInstance(estimate, Value)
+
+
+    def test_data_and_resamples_needed(self):
+        with self.assertRaises(ValueError):
+            Bootstrap([], mean)
+        with self.assertRaises(ValueError):
+            Bootstrap([1, 2], mean, resamples=1)
+
+
+    def test_repr(self):
+        bootstrap = Bootstrap([1, 2], mean, resamples=10)
+        self.assertEqual(repr(bootstrap), "<Bootstrap (10 resamples)>")
+
+
+
+class BootstrapBlockTests(TestCase):
+
+    def test_can_resample_block(self):
+        estimates = _resample((1, 0, 5), [1, 2, 3], sum)
+        self.assertEqual(len(estimates), 5)
+        for estimate in estimates:
+            self.assertGreaterEqual(estimate, 3)
+            self.assertLessEqual(estimate, 9)
+
+
+    def test_can_run_block_from_worker(self):
+        _worker["data"], _worker["statistic"] = [1, 2, 3], sum
+        try:
+            estimates = _run_block((1, 0, 5))
+        finally:
+            _worker.clear()
+        self.assertEqual(estimates, _resample((1, 0, 5), [1, 2, 3], sum))
+
+
+
+class BootstrapResultTests(TestCase):
+
+    def setUp(self):
+        self.bootstrap = Bootstrap([1, 2], mean, resamples=10)
+        self.bootstrap._value = 3
+        self.bootstrap._estimates = [4, 2, 1, 3, 5]
+
+
+    def test_can_get_estimates(self):
+        self.assertEqual(self.bootstrap.estimates(), [4, 2, 1, 3, 5])
+
+
+    def test_can_get_value(self):
+        value = self.bootstrap.value()
+        self.assertIsInstance(value, Value)
+        self.assertEqual(value.value(), 3)
+        self.assertAlmostEqual(value.error(), 2.5 ** 0.5)
+
+
+    def test_can_get_interval(self):
+        self.assertEqual(self.bootstrap.interval(0.5), (2, 4))
+        low, high = self.bootstrap.interval(0.9)
+        self.assertAlmostEqual(low, 1.2)
+        self.assertAlmostEqual(high, 4.8)
+        with self.assertRaises(ValueError):
+            self.bootstrap.interval(1)
+
+
+
+class PercentileTests(TestCase):
+
+    def test_can_get_percentile(self):
+        self.assertEqual(_percentile([1, 2, 3], 0), 1)
+        self.assertEqual(_percentile([1, 2, 3], 0.25), 1.5)
+        self.assertEqual(_percentile([1, 2, 3], 1), 3)
@@ -0,0 +1,155 @@
+from unittest import TestCase
+from fuzz.arrays import ValueArray
+from fuzz.calibration import CalibrationTable
+from fuzz.values import Value
+
+class CalibrationTableCreationTests(TestCase):
+
+    def test_can_create_table(self):
+        table = CalibrationTable(
+         [0, Value(20, 1), 10], [Value(1, 0.1), Value(41, 0.2), 21]
+        )
+        self.assertEqual(table._readings, [0, 10, 20])
+        self.assertEqual(table._values, [1, 21, 41])
+        self.assertEqual(table._errors, [0.1, 0, 0.2])
+        self.assertEqual(table._slopes, [2, 2])
+        self.assertEqual(table._scales, [0.1, 0.1])
+        self.assertEqual(table._step, 10)
+        self.assertFalse(table._extrapolate)
+
+
+    def test_can_create_non_uniform_table(self):
+        table = CalibrationTable([0, 1, 3], [0, 1, 5], extrapolate=True)
+        self.assertEqual(table._slopes, [1, 2])
+        self.assertEqual(table._scales, [1, 0.5])
+        self.assertIsNone(table._step)
+        self.assertTrue(table._extrapolate)
+
+
+    def test_table_needs_two_distinct_points(self):
+        with self.assertRaises(ValueError):
+            CalibrationTable([1], [2])
+        with self.assertRaises(ValueError):
+            CalibrationTable([1, 2], [2])
+        with self.assertRaises(ValueError):
+            CalibrationTable([1, 2, 1], [2, 3, 4])
+
+
+    def test_repr_and_length(self):
+        table = CalibrationTable([0, 1, 3], [0, 1, 5])
+        self.assertEqual(repr(table), "<CalibrationTable (3 points)>")
+        self.assertEqual(len(table), 3)
+
+
+
+class CalibrationTableConversionTests(TestCase):
+
+    def setUp(self):
+        self.table = CalibrationTable(
+         [0, 10, 20], [Value(1, 0.3), Value(21, 0.4), Value(41, 0)]
+        )
+
+
+    def test_can_convert_reading(self):
+        value = self.table(2.5)
+        self.assertIsInstance(value, Value)
+        self.assertEqual(value.value(), 6)
+        self.assertAlmostEqual(value.error(), (0.225 ** 2 + 0.1 ** 2) ** 0.5)
+        self.assertEqual(self.table(10).value(), 21)
+        self.assertEqual(self.table(10).error(), 0.4)
+        self.assertEqual(self.table(20).value(), 41)
+        self.assertEqual(self.table(20).error(), 0)
+
+
+    def test_can_convert_value(self):
+        value = self.table(Value(15, 0.5))
+        self.assertEqual(value.value(), 31)
+        self.assertAlmostEqual(value.error(), (0.2 ** 2 + 1 ** 2) ** 0.5)
+
+
+    def test_non_uniform_tables_use_bisection(self):
+        table = CalibrationTable([0, 1, 3], [0, 1, 5])
+        self.assertEqual(table(0.5).value(), 0.5)
+        self.assertEqual(table(1).value(), 1)
+        self.assertEqual(table(2).value(), 3)
+
+
+    def test_readings_must_be_in_table(self):
+        with self.assertRaises(ValueError):
+            self.table(-1)
+        with self.assertRaises(ValueError):
+            self.table(20.1)
+
+
+    def test_can_extrapolate(self):
+        table = CalibrationTable([0, 10], [Value(1, 0.3), 21], extrapolate=True)
+        value = table(-5)
+        self.assertEqual(value.value(), -9)
+        self.assertAlmostEqual(value.error(), 0.45)
+        self.assertEqual(table(15).value(), 31)
+
+
+    def test_can_convert_batch(self):
+        values = self.table.convert([2.5, 15], [0, 0.5])
+        self.assertIsInstance(values, ValueArray)
+        self.assertEqual(values.values(), [6, 31])
+        self.assertAlmostEqual(values.errors()[0], (0.225 ** 2 + 0.01) ** 0.5)
+        self.assertAlmostEqual(values.errors()[1], (0.04 + 1) ** 0.5)
+
+
+    def test_can_convert_batch_of_values(self):
+        for readings in (
+         ValueArray([2.5, 15], [0, 0.5]), [2.5, Value(15, 0.5)]
+        ):
+            values = self.table.convert(readings)
+            self.assertEqual(values.values(), [6, 31])
+            self.assertAlmostEqual(values.errors()[1], (0.04 + 1) ** 0.5)
+
+
+    def test_can_convert_batch_with_shared_error(self):
+        values = self.table.convert([15, Value(15, 0.5)], 0.5)
+        self.assertEqual(values.errors()[0], values.errors()[1])
+
+
+    def test_can_convert_batch_from_generator(self):
+        values = self.table.convert(reading for reading in [2.5, 15])
+        self.assertEqual(values.values(), [6, 31])
+
+
+    def test_can_convert_batch_of_values_with_errors(self):
+        values = self.table.convert([2.5, Value(15, 0.5)], [0, 0.1])
+        self.assertEqual(values.values(), [6, 31])
+        self.assertAlmostEqual(values.errors()[1], (0.04 + 1) ** 0.5)
+
+
+    def test_batch_errors_must_match_readings(self):
+        with self.assertRaises(ValueError):
+            self.table.convert([2.5, 15], [0, 0.5, 0.5])
+
+
+    def test_batch_errors_cant_be_negative(self):
+        with self.assertRaises(ValueError):
+            self.table.convert([2.5, 15], [0.1, -0.2])
+        with self.assertRaises(ValueError):
+            self.table.convert([2.5, 15], -0.2)
+
+
+    def test_batch_readings_must_be_in_table(self):
+        with self.assertRaises(ValueError):
+            self.table.convert([1, 2, 30])
+
+
+
+class CalibrationTableAccessTests(TestCase):
+
+    def test_can_get_points(self):
+        table = CalibrationTable([10, 0], [Value(2, 0.5), 1])
+        self.assertEqual(table.readings(), [0, 10])
+        values = table.values()
+        self.assertEqual([v.value() for v in values], [1, 2])
+        self.assertEqual([v.error() for v in values], [0, 0.5])
+
+
+    def test_can_check_uniformity(self):
+        self.assertTrue(CalibrationTable([0, 0.1, 0.2], [0, 1, 2]).is_uniform())
+        self.assertFalse(CalibrationTable([0, 1, 3], [0, 1, 2]).is_uniform())
@@ -0,0 +1,150 @@
+from unittest import TestCase
+from fuzz.arrays import ValueArray
+from fuzz.clipping import sigma_clip, sigma_clip_groups, _clip, _split
+from fuzz.clipping import _check_arguments
+from fuzz.groups import weighted_mean
+from fuzz.values import Value
+
+class SigmaClipTests(TestCase):
+
+    def test_can_clip_outliers(self):
+        mean, mask = sigma_clip([10.1, 9.9, 10.0, 10.2, 9.8, 15], 0.2)
+        self.assertIsInstance(mean, Value)
+        self.assertAlmostEqual(mean.value(), 10)
+        self.assertAlmostEqual(mean.error(), 0.2 / 5 ** 0.5)
+        self.assertEqual(mask, [True] * 5 + [False])
+
+
+    def test_can_clip_values(self):
+        mean, mask = sigma_clip([Value(10.1, 0.2), Value(9.9, 0.2), Value(30, 5)])
+        self.assertAlmostEqual(mean.value(), 10)
+        self.assertEqual(mask, [True, True, False])
+
+
+    def test_can_clip_array(self):
+        mean, mask = sigma_clip(
+         ValueArray([10.1, 9.9, 10.0, 30], [0.2, 0.2, 0.2, 5]), threshold=2
+        )
+        self.assertAlmostEqual(mean.value(), 10)
+        self.assertEqual(mask, [True, True, True, False])
+
+
+    def test_nothing_is_clipped_from_consistent_values(self):
+        mean, mask = sigma_clip([1, 1.1, 0.9], [0.1, 0.2, 0.1])
+        self.assertEqual(mask, [True] * 3)
+        self.assertAlmostEqual(mean.value(), 217.5 / 225)
+
+
+    def test_thresholds_can_differ_either_side(self):
+        values = [10.1, 9.9, 10.0, 10.2, 9.8, 11, 9]
+        self.assertEqual(sigma_clip(values, 0.2)[1], [True] * 5 + [False] * 2)
+        self.assertEqual(
+         sigma_clip(values, 0.2, upper=10)[1], [True] * 6 + [False]
+        )
+        self.assertEqual(
+         sigma_clip(values, 0.2, lower=10)[1], [True] * 5 + [False, True]
+        )
+
+
+    def test_iterations_can_be_limited(self):
+        values = [0, 0.1, -0.1, 0.2, 1, 3, 9]
+        self.assertEqual(
+         sigma_clip(values, 0.1, threshold=4, iterations=1)[1],
+         [True] * 4 + [False] * 3
+        )
+        self.assertEqual(
+         sigma_clip(values, 0.1, threshold=4, iterations=None)[1],
+         [True] * 4 + [False] * 3
+        )
+
+
+    def test_every_value_cannot_be_clipped(self):
+        mean, mask = sigma_clip([0, 10], 0.1)
+        self.assertEqual(mask, [True, True])
+        self.assertEqual(mean.value(), 5)
+
+
+    def test_arguments_must_be_valid(self):
+        with self.assertRaises(ValueError):
+            sigma_clip([], 0.1)
+        with self.assertRaises(ValueError):
+            sigma_clip([1, 2], [0.1, 0])
+        with self.assertRaises(ValueError):
+            sigma_clip([1, 2], 0.1, threshold=0)
+        with self.assertRaises(ValueError):
+            sigma_clip([1, 2], 0.1, iterations=0)
+        with self.assertRaises(ValueError):
+            sigma_clip([1, 2], [0.1])
+
+
+
+class GroupClippingTests(TestCase):
+
+    def test_can_clip_groups(self):
+        means, mask = sigma_clip_groups(
+         "abaabb", [1, 5, 1.1, 9, 5.1, 5.05], 0.1
+        )
+        self.assertEqual(list(means), ["a", "b"])
+        self.assertAlmostEqual(means["a"].value(), 1.05)
+        self.assertAlmostEqual(means["b"].value(), 5.05)
+        self.assertEqual(mask, [True, True, True, False, True, True])
+
+
+    def test_groups_match_separate_clipping(self):
+        values = [Value(n % 7 + (n % 3) * 0.1, 0.1 + n % 4 * 0.1)
+         for n in range(60)]
+        keys = [n % 5 for n in range(60)]
+        means, mask = sigma_clip_groups(keys, values, threshold=2)
+        for key in range(5):
+            mean, kept = sigma_clip(values[key::5], threshold=2)
+            self.assertEqual(means[key].value(), mean.value())
+            self.assertEqual(means[key].error(), mean.error())
+            self.assertEqual(mask[key::5], kept)
+
+
+    def test_keys_must_match_values(self):
+        with self.assertRaises(ValueError):
+            sigma_clip_groups("ab", [1, 2, 3], 0.1)
+
+
+
+class ClippingHelperTests(TestCase):
+
+    def test_can_split_values(self):
+        self.assertEqual(_split(ValueArray([1, 2], 0.5), None), (
+         [1, 2], [0.5, 0.5]
+        ))
+        self.assertEqual(_split([Value(1, 0.5), 2], None), ([1, 2], [0.5, 0]))
+        self.assertEqual(_split((1, 2), 0.5), ([1, 2], [0.5, 0.5]))
+        self.assertEqual(_split((1, 2), (0.5, 0.25)), ([1, 2], [0.5, 0.25]))
+
+
+    def test_split_errors_cant_be_negative(self):
+        with self.assertRaises(ValueError):
+            _split((1, 2), (0.5, -0.25))
+        with self.assertRaises(ValueError):
+            _split((1, 2), -0.5)
+
+
+    def test_can_get_thresholds(self):
+        self.assertEqual(_check_arguments(3, 5, None, None), (3, 3))
+        self.assertEqual(_check_arguments(3, None, 2, None), (2, 3))
+        self.assertEqual(_check_arguments(3, 5, None, 4), (3, 4))
+
+
+    def test_clipping_starts_from_median(self):
+        mean, mask = _clip([10, 10.1, 15], [0.1, 0.1, 0.01], 3, 3, 5)
+        self.assertEqual(mask, [True, True, False])
+
+
+    def test_clipped_mean_matches_weighted_mean_of_kept_values(self):
+        numbers = [1, 1.2, 0.9, 1.1, 7, 1.05]
+        errors = [0.1, 0.2, 0.1, 0.3, 0.2, 0.1]
+        mean, mask = _clip(numbers, errors, 3, 3, 5)
+        self.assertEqual(mask, [True, True, True, True, False, True])
+        expected = weighted_mean(
+         [n for n, kept in zip(numbers, mask) if kept],
+         [e for e, kept in zip(errors, mask) if kept]
+        )
+        self.assertEqual(mean.value(), expected.value())
+        self.assertEqual(mean.error(), expected.error())
@@ -0,0 +1,165 @@
+from math import inf, sqrt
+from unittest import TestCase
+from unittest.mock import patch
+from fuzz.arrays import ValueArray
+from fuzz.comparison import Comparison, _compare, _filter, _significance
+from fuzz.comparison import _worker
+from fuzz.values import Value
+
+class ComparisonCreationTests(TestCase):
+
+    def test_can_create_comparison(self):
+        comparison = Comparison([Value(1, 3), 2], ValueArray([4, 5, 6], 0.5))
+        self.assertEqual(comparison._data, (
+         [1, 2], [3, 0], [9, 0], [4, 5, 6], [0.5] * 3, [0.25] * 3
+        ))
+        self.assertEqual(comparison._tile_size, 512)
+        self.assertEqual(comparison._processes, 1)
+
+
+    def test_tile_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            Comparison([1], [2], tile_size=0)
+
+
+    def test_comparison_repr(self):
+        comparison = Comparison([1, 2], [3, 4, 5])
+        self.assertEqual(str(comparison), "<Comparison (2 × 3 pairs)>")
+
+
+    def test_comparison_shape(self):
+        self.assertEqual(Comparison([1, 2], [3, 4, 5]).shape(), (2, 3))
+
+
+
+class ComparisonTileTests(TestCase):
+
+    def setUp(self):
+        self.first = [Value(1, 0.3), Value(2, 0.4), Value(10, 0)]
+        self.second = [Value(1.5, 0.4), Value(10, 0), Value(4, 1.2)]
+
+
+    def test_can_compare_tile(self):
+        data = Comparison(self.first, self.second)._data
+        row, column, significances, consistencies = _compare(
+         (1, 1, 2), data
+        )
+        self.assertEqual((row, column), (1, 1))
+        self.assertEqual(len(significances), 2)
+        self.assertEqual(list(significances[0]), [8 / 0.4, 2 / sqrt(1.6)])
+        self.assertEqual(list(significances[1]), [0, 6 / 1.2])
+        self.assertEqual(consistencies, [b"\x00\x00", b"\x01\x00"])
+
+
+    def test_can_filter_tile(self):
+        data = Comparison(self.first, self.second)._data
+        self.assertEqual(_filter((0, 3, 0, 3, 5), data), [
+         (0, 1, 30), (1, 1, 20), (2, 0, 21.25), (2, 2, 5)
+        ])
+        self.assertEqual(_filter((1, 2, 1, 2, 5), data), [
+         (1, 1, 20), (2, 2, 5)
+        ])
+
+
+    def test_tiles_cover_every_pair(self):
+        comparison = Comparison(self.first, self.second, tile_size=2)
+        tiles = list(comparison.tiles())
+        self.assertEqual([tile[:2] for tile in tiles], [
+         (0, 0), (0, 2), (2, 0), (2, 2)
+        ])
+        self.assertEqual([len(tile[2]) for tile in tiles], [2, 2, 1, 1])
+        self.assertEqual([len(tile[2][0]) for tile in tiles], [2, 1, 2, 1])
+
+
+    def test_tiles_match_values(self):
+        comparison = Comparison(self.first, self.second, tile_size=2)
+        for row, column, significances, consistencies in comparison.tiles():
+            for i, (significance, consistency) in enumerate(
+             zip(significances, consistencies)
+            ):
+                for j in range(len(significance)):
+                    a, b = self.first[row + i], self.second[column + j]
+                    self.assertEqual(
+                     consistency[j], a.consistent_with(b)
+                    )
+                    if a.error() or b.error():
+                        self.assertAlmostEqual(significance[j], abs(
+                         a.value() - b.value()
+                        ) / sqrt(a.error() ** 2 + b.error() ** 2))
+
+
+    def test_can_get_significant_pairs(self):
+        comparison = Comparison(self.first, self.second, tile_size=2)
+        self.assertEqual(list(comparison.significant(5)), [
+         (0, 1, 30), (1, 1, 20), (2, 0, 21.25), (2, 2, 5)
+        ])
+        self.assertEqual(len(list(comparison.significant(0))), 9)
+        self.assertEqual(len(list(comparison.significant(-1))), 9)
+
+
+    def test_significant_pairs_are_in_row_order(self):
+        comparison = Comparison(self.first, self.second, tile_size=1)
+        self.assertEqual([pair[:2] for pair in comparison.significant(1)], [
+         (0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 0), (2, 2)
+        ])
+
+
+    def test_significant_pairs_are_found_a_tile_at_a_time(self):
+        first = [Value(n, 0.1) for n in range(10)]
+        second = [Value(n / 3, 0.1) for n in range(30)]
+        expected = list(Comparison(first, second).significant(0))
+        for tile_size, pieces in ((3, [(0, 1, 0, 9), (0, 1, 9, 9)]), (10, [
+         (0, 3, 0, 30), (3, 3, 0, 30)
+        ])):
+            comparison = Comparison(first, second, tile_size=tile_size)
+            with patch("fuzz.comparison._filter", wraps=_filter) as mock_filter:
+                self.assertEqual(list(comparison.significant(0)), expected)
+            tasks = [call[0][0] for call in mock_filter.call_args_list]
+            self.assertEqual([task[:4] for task in tasks[:2]], pieces)
+            for task in tasks:
+                self.assertLessEqual(task[1] * task[3], tile_size * tile_size)
+
+
+    def test_significance_threshold_is_inclusive(self):
+        comparison = Comparison([Value(0, 0.3)], [Value(1.2, 0.4)])
+        self.assertEqual(list(comparison.significant(2.4)), [(0, 0, 2.4)])
+
+
+    def test_can_get_matrix(self):
+        comparison = Comparison(self.first, self.second, tile_size=2)
+        matrix = comparison.matrix()
+        self.assertEqual(len(matrix), 3)
+        self.assertEqual(matrix[1][1], 20)
+        self.assertEqual(matrix[2][1], 0)
+        self.assertEqual(list(map(list, matrix)), list(map(list, Comparison(
+         self.first, self.second
+        ).matrix())))
+
+
+    def test_empty_comparisons(self):
+        self.assertEqual(list(Comparison([], [1]).tiles()), [])
+        self.assertEqual(list(map(list, Comparison([1, 2], []).matrix())), [[], []])
+
+
+    def test_processes_dont_change_results(self):
+        first = [Value(n, 0.1 + n % 3) for n in range(30)]
+        second = [Value(n / 2, 0.2) for n in range(25)]
+        comparison1 = Comparison(first, second, tile_size=7)
+        comparison2 = Comparison(first, second, tile_size=7, processes=2)
+        self.assertEqual(list(comparison1.tiles()), list(comparison2.tiles()))
+        self.assertEqual(
+         list(comparison1.significant(2)), list(comparison2.significant(2))
+        )
+        self.assertEqual(_worker, {})
+
+
+
+class SignificanceTests(TestCase):
+
+    def test_significance_with_variance(self):
+        self.assertEqual(_significance(3, 4), 1.5)
+
+
+    def test_significance_without_variance(self):
+        self.assertEqual(_significance(3, 0), inf)
+        self.assertEqual(_significance(0, 0), 0)
@@ -0,0 +1,224 @@
+import io
+from unittest import TestCase
+from fuzz.arrays import ValueArray
+from fuzz.export import format_value, format_values, Writer
+from fuzz.export import _chunks, _round, _round_one, _quote
+from fuzz.values import Value
+
+class ValueFormattingTests(TestCase):
+
+    def test_can_format_value(self):
+        self.assertEqual(format_value(Value(12.3456, 0.0234)), "12.346 ± 0.023")
+        self.assertEqual(format_value(Value(-0.00123456, 4.56e-5)), (
+         "-0.001235 ± 0.000046"
+        ))
+        self.assertEqual(format_value(Value(123456, 340)), "123460 ± 340")
+
+
+    def test_can_format_value_to_other_figures(self):
+        self.assertEqual(format_value(Value(12.3456, 0.0234), 1), "12.35 ± 0.02")
+        self.assertEqual(format_value(Value(123456, 340), 1), "123500 ± 300")
+        self.assertEqual(format_value(Value(12.3456, 0.0234), 3), (
+         "12.3456 ± 0.0234"
+        ))
+
+
+    def test_errors_can_round_up_to_next_power(self):
+        self.assertEqual(format_value(Value(12.3456, 0.0996)), "12.35 ± 0.10")
+        self.assertEqual(format_value(Value(99.96, 0.96), 1), "100 ± 1")
+
+
+    def test_values_without_error_are_shown_in_full(self):
+        self.assertEqual(format_value(Value(12.3456)), "12.3456")
+        self.assertEqual(format_value(3), "3")
+
+
+    def test_figures_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            format_value(Value(1, 0.1), 0)
+
+
+
+class BulkFormattingTests(TestCase):
+
+    def test_can_format_values(self):
+        self.assertEqual(format_values([Value(1.23456, 0.012), 2]), [
+         "1.235 ± 0.012", "2"
+        ])
+
+
+    def test_can_format_array(self):
+        self.assertEqual(format_values(ValueArray([1.23456, 2.34567], 0.012)), [
+         "1.235 ± 0.012", "2.346 ± 0.012"
+        ])
+
+
+    def test_can_format_nothing(self):
+        self.assertEqual(format_values([]), [])
+
+
+    def test_bulk_formatting_matches_single_formatting(self):
+        values = [
+         Value(12.3456, 0.0234), Value(123456, 340), Value(1.5, float("inf")),
+         Value(float("nan"), 1), Value(-4.4444, 0.0444), Value(7)
+        ]
+        for figures in (1, 2, 3):
+            self.assertEqual(format_values(values, figures), [
+             format_values([value], figures)[0] for value in values
+            ])
+
+
+
+class RoundingTests(TestCase):
+
+    def test_can_get_decimal_places(self):
+        self.assertEqual(_round([1, 2, 3], [0.0234, 0.0996, 4], 2), (
+         [3, 2, 1], [1, 2, 3], [0.0234, 0.0996, 4]
+        ))
+        self.assertEqual(_round([1, 2], [0.0234, 0.0996], 1)[0], [2, 1])
+
+
+    def test_large_errors_are_rounded_in_advance(self):
+        self.assertEqual(_round([123456, 2], [340, 0.5], 2), (
+         [0, 2], [123460, 2], [340, 0.5]
+        ))
+
+
+    def test_decimal_places_need_well_behaved_rows(self):
+        self.assertIsNone(_round([1, 2], [0.1, 0], 2))
+        self.assertIsNone(_round([1, 2], [0.1, float("inf")], 2))
+        self.assertIsNone(_round([1, 2], [0.1, float("nan")], 2))
+        self.assertIsNone(_round([1, float("nan")], [0.1, 0.1], 2))
+
+
+    def test_can_round_single_row(self):
+        self.assertEqual(_round_one(12.3456, 0.0234, 2), ("12.346", "0.023"))
+        self.assertEqual(_round_one(123456, 340, 2), ("123460", "340"))
+        self.assertEqual(_round_one(12.5, 0, 2), ("12.5", "0"))
+        self.assertEqual(_round_one(float("inf"), 1, 2), ("inf", "1"))
+
+
+
+class WriterTests(TestCase):
+
+    def setUp(self):
+        self.values = [Value(1.2345, 0.012), Value(2), Value(3.14159, 0.5)]
+
+
+    def test_can_create_writer(self):
+        stream = io.StringIO()
+        writer = Writer(stream)
+        self.assertIs(writer._stream, stream)
+        self.assertEqual(writer._format, "csv")
+        self.assertEqual(writer._figures, 2)
+        self.assertEqual(writer._chunk_size, 8192)
+        self.assertTrue(writer._header)
+        self.assertIsNone(writer._labelled)
+        self.assertEqual(str(writer), "<Writer (csv)>")
+
+
+    def test_writer_arguments_must_be_valid(self):
+        with self.assertRaises(ValueError):
+            Writer(io.StringIO(), format="xml")
+        with self.assertRaises(ValueError):
+            Writer(io.StringIO(), figures=0)
+        with self.assertRaises(ValueError):
+            Writer(io.StringIO(), chunk_size=0)
+
+
+    def test_can_write_csv(self):
+        stream = io.StringIO()
+        self.assertEqual(Writer(stream, chunk_size=2).write(self.values), 3)
+        self.assertEqual(stream.getvalue(), (
+         "value,error\n1.234,0.012\n2,0\n3.14,0.50\n"
+        ))
+
+
+    def test_can_write_tsv_without_header(self):
+        stream = io.StringIO()
+        Writer(stream, "tsv", header=False).write(ValueArray([1, 2], 0.25))
+        self.assertEqual(stream.getvalue(), "1.00\t0.25\n2.00\t0.25\n")
+
+
+    def test_can_write_json_lines(self):
+        stream = io.StringIO()
+        Writer(stream, "jsonl", figures=1).write(
+         self.values + [Value(float("nan"), 1)]
+        )
+        self.assertEqual(stream.getvalue(), (
+         '{"value": 1.23, "error": 0.01}\n{"value": 2, "error": 0}\n'
+         '{"value": 3.1, "error": 0.5}\n{"value": NaN, "error": 1}\n'
+        ))
+
+
+    def test_can_write_labels(self):
+        stream = io.StringIO()
+        writer = Writer(stream, chunk_size=2)
+        writer.write(self.values, labels=["a", 'b,"x"', None])
+        writer.write([Value(4, 1)], labels=iter([5]))
+        self.assertEqual(stream.getvalue(), (
+         'label,value,error\na,1.234,0.012\n"b,""x""",2,0\n,3.14,0.50\n'
+         '5,4.0,1.0\n'
+        ))
+        stream = io.StringIO()
+        Writer(stream, "jsonl").write(self.values[:2], labels=["a", None])
+        self.assertEqual(stream.getvalue(), (
+         '{"label": "a", "value": 1.234, "error": 0.012}\n'
+         '{"label": null, "value": 2, "error": 0}\n'
+        ))
+
+
+    def test_labels_must_match_values(self):
+        with self.assertRaises(ValueError):
+            Writer(io.StringIO()).write(self.values, labels=["a", "b"])
+        with self.assertRaises(ValueError):
+            Writer(io.StringIO()).write(self.values, labels="abcd")
+
+
+    def test_labels_must_be_used_consistently(self):
+        writer = Writer(io.StringIO())
+        writer.write(self.values)
+        with self.assertRaises(ValueError):
+            writer.write(self.values, labels="abc")
+        writer = Writer(io.StringIO())
+        writer.write(self.values, labels="abc")
+        with self.assertRaises(ValueError):
+            writer.write(self.values)
+
+
+    def test_header_is_only_written_once(self):
+        stream = io.StringIO()
+        writer = Writer(stream)
+        writer.write([Value(1, 0.5)])
+        writer.write([Value(2, 0.5)])
+        self.assertEqual(stream.getvalue(), "value,error\n1.00,0.50\n2.00,0.50\n")
+
+
+
+class ChunkingTests(TestCase):
+
+    def test_can_chunk_array(self):
+        chunks = list(_chunks(ValueArray([1, 2, 3], [0.1, 0.2, 0.3]), 2))
+        self.assertEqual(chunks, [([1, 2], [0.1, 0.2]), ([3], [0.3])])
+
+
+    def test_can_chunk_values(self):
+        chunks = list(_chunks(iter([Value(1, 0.5), 2, Value(3, 1)]), 2))
+        self.assertEqual(chunks, [([1, 2], [0.5, 0]), ([3], [1])])
+
+
+
+class QuotingTests(TestCase):
+
+    def test_plain_labels_are_not_quoted(self):
+        self.assertEqual(_quote("abc", ","), "abc")
+        self.assertEqual(_quote("a,c", "\t"), "a,c")
+        self.assertEqual(_quote(12, ","), "12")
+        self.assertEqual(_quote(None, ","), "")
+
+
+    def test_labels_are_quoted_if_needed(self):
+        self.assertEqual(_quote("a,c", ","), '"a,c"')
+        self.assertEqual(_quote("a\tc", "\t"), '"a\tc"')
+        self.assertEqual(_quote('a"c', ","), '"a""c"')
+        self.assertEqual(_quote("a\nc", ","), '"a\nc"')
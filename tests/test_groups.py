@@ -0,0 +1,137 @@
+from unittest import TestCase
+from fuzz.arrays import ValueArray
+from fuzz.groups import GroupBy, weighted_mean
+from fuzz.values import Value
+
+class GroupByCreationTests(TestCase):
+
+    def test_can_group_values(self):
+        groups = GroupBy(["b", "a", "b"], [Value(1, 0.1), Value(2, 0.2), 3])
+        self.assertEqual(
+         groups._groups, {"b": ([1, 3], [0.1, 0]), "a": ([2], [0.2])}
+        )
+        self.assertEqual(list(groups._groups), ["b", "a"])
+
+
+    def test_can_group_value_array(self):
+        groups = GroupBy([2, 1, 2], ValueArray([1, 2, 3], [0.5, 0.25, 0.125]))
+        self.assertEqual(
+         groups._groups, {2: ([1, 3], [0.5, 0.125]), 1: ([2], [0.25])}
+        )
+
+
+    def test_can_group_numbers_and_errors(self):
+        groups = GroupBy([2, 1, 2], [1, 2, 3], [0.5, 0.25, 0.125])
+        self.assertEqual(
+         groups._groups, {2: ([1, 3], [0.5, 0.125]), 1: ([2], [0.25])}
+        )
+        groups = GroupBy([2, 1, 2], [1, 2, 3], 0.5)
+        self.assertEqual(
+         groups._groups, {2: ([1, 3], [0.5, 0.5]), 1: ([2], [0.5])}
+        )
+
+
+    def test_can_group_nothing(self):
+        groups = GroupBy([], [])
+        self.assertEqual(groups._groups, {})
+        self.assertEqual(groups.sum(), {})
+
+
+    def test_errors_cant_be_negative(self):
+        with self.assertRaises(ValueError):
+            GroupBy([1, 2], [1, 2], [0.5, -0.5])
+        with self.assertRaises(ValueError):
+            GroupBy([1, 2], [1, 2], -0.5)
+
+
+    def test_keys_must_be_hashable(self):
+        with self.assertRaises(TypeError):
+            GroupBy([[1], [2]], [1, 2])
+
+
+    def test_lengths_must_match(self):
+        with self.assertRaises(ValueError):
+            GroupBy([1, 2], [1, 2, 3])
+        with self.assertRaises(ValueError):
+            GroupBy([1, 2], [1, 2], [0.1])
+
+
+    def test_repr(self):
+        groups = GroupBy([1, 2, 1], [1, 2, 3])
+        self.assertEqual(repr(groups), "<GroupBy (2 groups)>")
+
+
+
+class GroupByReductionTests(TestCase):
+
+    def setUp(self):
+        self.groups = GroupBy(
+         ["x", "y", "x", "x", "y"],
+         [Value(1, 3), Value(10, 1), Value(5, 4), Value(3, 0), Value(12, 1)]
+        )
+
+
+    def test_can_get_keys_and_counts(self):
+        self.assertEqual(len(self.groups), 2)
+        self.assertEqual(self.groups.keys(), ["x", "y"])
+        self.assertEqual(self.groups.counts(), {"x": 3, "y": 2})
+
+
+    def test_can_sum(self):
+        sums = self.groups.sum()
+        self.assertEqual(list(sums), ["x", "y"])
+        self.assertEqual(sums["x"].value(), 9)
+        self.assertEqual(sums["x"].error(), 5)
+        self.assertEqual(sums["y"].value(), 22)
+        self.assertAlmostEqual(sums["y"].error(), 2 ** 0.5)
+
+
+    def test_can_get_mean(self):
+        means = self.groups.mean()
+        self.assertEqual(means["x"].value(), 3)
+        self.assertAlmostEqual(means["x"].error(), 5 / 3)
+        self.assertEqual(means["y"].value(), 11)
+        self.assertAlmostEqual(means["y"].error(), 2 ** 0.5 / 2)
+
+
+    def test_can_get_weighted_mean(self):
+        means = GroupBy([1, 1, 2], [10, 20, 5], [1, 2, 4]).weighted_mean()
+        self.assertAlmostEqual(means[1].value(), 12)
+        self.assertAlmostEqual(means[1].error(), 0.8 ** 0.5)
+        self.assertEqual(means[2].value(), 5)
+        self.assertEqual(means[2].error(), 4)
+        with self.assertRaises(ValueError):
+            self.groups.weighted_mean()
+
+
+    def test_can_get_min_and_max(self):
+        minima, maxima = self.groups.min(), self.groups.max()
+        self.assertEqual(minima["x"].value(), 1)
+        self.assertEqual(minima["x"].error(), 3)
+        self.assertEqual(minima["y"].value(), 10)
+        self.assertEqual(maxima["x"].value(), 5)
+        self.assertEqual(maxima["x"].error(), 4)
+        self.assertEqual(maxima["y"].value(), 12)
+
+
+    def test_can_check_consistency(self):
+        self.assertEqual(self.groups.consistent(), {"x": True, "y": True})
+        groups = GroupBy([1, 1, 1], [Value(3, 0.4), Value(3.4, 0.01), 4])
+        self.assertEqual(groups.consistent(), {1: False})
+
+
+
+class WeightedMeanTests(TestCase):
+
+    def test_can_get_weighted_mean(self):
+        mean = weighted_mean([10, 20], [1, 2])
+        self.assertIsInstance(mean, Value)
+        self.assertAlmostEqual(mean.value(), 12)
+        self.assertAlmostEqual(mean.error(), 0.8 ** 0.5)
+
+
+    def test_weighted_mean_needs_errors(self):
+        with self.assertRaises(ValueError):
+            weighted_mean([], [])
+        with self.assertRaises(ValueError):
+            weighted_mean([1, 2], [1, 0])
@@ -0,0 +1,149 @@
+from operator import add
+from unittest import TestCase
+from unittest.mock import Mock
+from fuzz.reactive import Node
+from fuzz.values import Value
+
+class NodeCreationTests(TestCase):
+
+    def test_can_create_input_node(self):
+        node = Node(23, 0.5)
+        self.assertIsInstance(node._value, Value)
+        self.assertEqual(node._value._value, 23)
+        self.assertEqual(node._value._error, 0.5)
+        self.assertIsNone(node._function)
+        self.assertEqual(node._operands, ())
+        self.assertFalse(node._dirty)
+        self.assertEqual(len(node._children), 0)
+
+
+    def test_input_node_needs_numbers(self):
+        with self.assertRaises(TypeError):
+            Node("23")
+        with self.assertRaises(ValueError):
+            Node(23, -1)
+
+
+    def test_can_derive_node(self):
+        node1, node2 = Node(1), Node(2)
+        node3 = Node.derive(add, node1, node2, 3)
+        self.assertIsNone(node3._value)
+        self.assertIs(node3._function, add)
+        self.assertEqual(node3._operands, (node1, node2, 3))
+        self.assertTrue(node3._dirty)
+        self.assertEqual(set(node1._children), {node3})
+        self.assertEqual(set(node2._children), {node3})
+
+
+    def test_derived_nodes_can_be_garbage_collected(self):
+        node = Node(1)
+        node + 1
+        self.assertEqual(len(node._children), 0)
+
+
+
+class NodeArithmeticTests(TestCase):
+
+    def test_operators_derive_nodes(self):
+        node = Node(2, 0.5)
+        for derived, value in (
+         (node + 1, 3), (1 + node, 3), (node - 1, 1), (1 - node, -1),
+         (node * 3, 6), (3 * node, 6), (node / 4, 0.5), (4 / node, 2),
+         (node ** 2, 4), (node + Value(1, 0.5), 3), (Value(1) + node, 3),
+        ):
+            self.assertIsInstance(derived, Node)
+            self.assertEqual(derived.get().value(), value)
+
+
+
+class NodeGettingTests(TestCase):
+
+    def test_can_get_input_value(self):
+        node = Node(23, 0.5)
+        self.assertIs(node.get(), node._value)
+
+
+    def test_derived_values_are_calculated_lazily(self):
+        function = Mock(return_value=Value(5))
+        node = Node.derive(function, Node(2), 3)
+        function.assert_not_called()
+        self.assertIs(node.get(), function.return_value)
+        function.assert_called_once_with(Value(2), 3)
+        self.assertFalse(node._dirty)
+        node.get()
+        function.assert_called_once()
+
+
+    def test_dependencies_are_calculated_first(self):
+        node1 = Node(2)
+        node2 = node1 * 3
+        node3 = node2 + node1
+        node4 = node3 + node2
+        self.assertEqual(node4.get().value(), 14)
+        self.assertFalse(node2._dirty)
+        self.assertFalse(node3._dirty)
+
+
+    def test_deep_graphs_dont_recurse(self):
+        node = root = Node(0)
+        for _ in range(5000):
+            node = node + 1
+        self.assertEqual(node.get().value(), 5000)
+        root.set(10)
+        self.assertEqual(node.get().value(), 5010)
+
+
+
+class NodeSettingTests(TestCase):
+
+    def test_setting_marks_descendants_stale(self):
+        node1, node2 = Node(1), Node(2)
+        node3, node4 = node1 + 1, node2 + 1
+        node5 = node3 + node4
+        node5.get()
+        node1.set(10, 0.5)
+        self.assertEqual(node1._value.value(), 10)
+        self.assertEqual(node1._value.error(), 0.5)
+        self.assertTrue(node3._dirty)
+        self.assertTrue(node5._dirty)
+        self.assertFalse(node4._dirty)
+
+
+    def test_only_stale_nodes_are_recalculated(self):
+        node1, node2 = Node(1), Node(2)
+        function1, function2 = Mock(side_effect=add), Mock(side_effect=add)
+        node3 = Node.derive(function1, node1, 1)
+        node4 = Node.derive(function2, node2, 1)
+        node5 = node3 + node4
+        self.assertEqual(node5.get().value(), 5)
+        node1.set(10)
+        self.assertEqual(node5.get().value(), 14)
+        self.assertEqual(function1.call_count, 2)
+        self.assertEqual(function2.call_count, 1)
+
+
+    def test_cannot_set_derived_node(self):
+        with self.assertRaises(ValueError):
+            (Node(1) + 1).set(3)
+
+
+
+class NodeStateTests(TestCase):
+
+    def test_can_check_for_input(self):
+        node = Node(1)
+        self.assertTrue(node.is_input())
+        self.assertFalse((node + 1).is_input())
+
+
+    def test_can_check_for_staleness(self):
+        node1 = Node(1)
+        node2 = node1 + 1
+        self.assertFalse(node1.is_stale())
+        self.assertTrue(node2.is_stale())
+        node2.get()
+        self.assertFalse(node2.is_stale())
+
+
+    def test_repr(self):
+        self.assertEqual(repr(Node(23, 0.5) + 1), "<Node: 24 ± 0.5>")
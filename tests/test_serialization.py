@@ -0,0 +1,170 @@
+import io
+import struct
+from unittest import TestCase
+from fuzz.arrays import ValueArray
+from fuzz.serialization import pack_value, unpack_value, encode, decode
+from fuzz.serialization import Encoder, Decoder, _swap
+from fuzz.values import Value
+
+class ValuePackingTests(TestCase):
+
+    def test_can_pack_value(self):
+        self.assertEqual(pack_value(Value(1.5, 0.25)), struct.pack("<dd", 1.5, 0.25))
+        self.assertEqual(pack_value(3), struct.pack("<dd", 3, 0))
+
+
+    def test_can_unpack_value(self):
+        value = unpack_value(struct.pack("<dd", 1.5, 0.25))
+        self.assertIsInstance(value, Value)
+        self.assertEqual(value._value, 1.5)
+        self.assertEqual(value._error, 0.25)
+
+
+    def test_record_must_be_right_size(self):
+        with self.assertRaises(ValueError):
+            unpack_value(bytes(15))
+
+
+
+class EncodingTests(TestCase):
+
+    def test_can_encode_array(self):
+        array = ValueArray([1, 2], [0.5, 0.25], dtype="float32")
+        payload = encode(array)
+        self.assertEqual(len(payload), 24 + 8 + 8)
+        self.assertEqual(payload[:6], b"FZ\x01\x02\x02\x00")
+        self.assertEqual(struct.unpack("<Q", payload[8:16]), (2,))
+        self.assertEqual(payload[24:], struct.pack("<2f2f", 1, 2, 0.5, 0.25))
+
+
+    def test_can_encode_shared_error_array(self):
+        payload = encode(ValueArray([1, 2], 0.5, error_dtype="float16"))
+        self.assertEqual(len(payload), 24 + 16)
+        self.assertEqual(payload[:6], b"FZ\x01\x01\x03\x01")
+        self.assertEqual(struct.unpack("<d", payload[16:24]), (0.5,))
+
+
+    def test_can_encode_values(self):
+        payload = encode([Value(1, 0.5), 2])
+        self.assertEqual(payload[:6], b"FZ\x01\x01\x01\x00")
+        self.assertEqual(payload[24:], struct.pack("<4d", 1, 2, 0.5, 0))
+
+
+
+class DecodingTests(TestCase):
+
+    def test_can_decode_payload(self):
+        for array in (
+         ValueArray([1, 2], [0.5, 0.25], dtype="float32", error_dtype="float16"),
+         ValueArray([1, 2], 0.5, error_dtype="float16"), ValueArray([]),
+        ):
+            decoded = decode(encode(array))
+            self.assertEqual(decoded.values(), array.values())
+            self.assertEqual(decoded.errors(), array.errors())
+            self.assertEqual(decoded.dtype(), array.dtype())
+            self.assertEqual(decoded.error_dtype(), array.error_dtype())
+            self.assertEqual(decoded.shared_error(), array.shared_error())
+
+
+    def test_decoding_does_not_copy(self):
+        payload = bytearray(encode(ValueArray([1, 2], [0.5, 0.25])))
+        decoded = decode(payload)
+        payload[24:32] = struct.pack("<d", 10)
+        self.assertEqual(decoded.values(), [10, 2])
+
+
+    def test_can_step_slice_decoded_arrays(self):
+        for dtype in ("float64", "float32", "float16"):
+            for errors in ([0.5, 1, 1.5, 2], 0.5):
+                array = decode(encode(
+                 ValueArray([1, 2, 3, 4], errors, dtype=dtype)
+                ))[::2]
+                self.assertEqual(array.values(), [1, 3])
+                self.assertEqual([v._value for v in array], [1, 3])
+                copy = decode(encode(array))
+                self.assertEqual(copy.values(), [1, 3])
+                self.assertEqual(copy.errors(), array.errors())
+
+
+    def test_payload_must_be_valid(self):
+        payload = encode(ValueArray([1, 2], [0.5, 0.25]))
+        with self.assertRaises(ValueError):
+            decode(b"XX" + payload[2:])
+        with self.assertRaises(ValueError):
+            decode(payload[:2] + b"\x02" + payload[3:])
+        with self.assertRaises(ValueError):
+            decode(payload[:3] + b"\x09" + payload[4:])
+        with self.assertRaises(ValueError):
+            decode(payload[:-1])
+        with self.assertRaises(ValueError):
+            decode(payload + b"\x00")
+
+
+    def test_payload_must_have_full_header(self):
+        payload = encode(ValueArray([1, 2], [0.5, 0.25]))
+        for truncated in (b"", b"FZ", payload[:23]):
+            with self.assertRaises(ValueError):
+                decode(truncated)
+
+
+
+class StreamingTests(TestCase):
+
+    def test_can_stream_batches(self):
+        stream = io.BytesIO()
+        encoder = Encoder(stream)
+        self.assertEqual(encoder.write(ValueArray([1, 2], [0.5, 0.25])), 56)
+        self.assertEqual(encoder.write([Value(3, 1)]), 40)
+        self.assertEqual(encoder.write(ValueArray([4], 2, dtype="float16")), 26)
+        stream.seek(0)
+        batches = list(Decoder(stream))
+        self.assertEqual(len(batches), 3)
+        self.assertEqual(batches[0].errors(), [0.5, 0.25])
+        self.assertEqual(batches[1].values(), [3])
+        self.assertEqual(batches[2].shared_error(), 2)
+        self.assertEqual(stream.getvalue(), b"".join([
+         encode(ValueArray([1, 2], [0.5, 0.25])), encode([Value(3, 1)]),
+         encode(ValueArray([4], 2, dtype="float16"))
+        ]))
+
+
+    def test_can_read_streams_without_readinto(self):
+        class Stream:
+            def __init__(self, data):
+                self.data = data
+            def read(self, size):
+                chunk, self.data = self.data[:3], self.data[3:]
+                return chunk
+        decoder = Decoder(Stream(encode([Value(3, 1), 4])))
+        self.assertEqual(decoder.read().values(), [3, 4])
+        self.assertIsNone(decoder.read())
+
+
+    def test_truncated_streams_are_errors(self):
+        decoder = Decoder(io.BytesIO(encode([Value(3, 1)])[:-1]))
+        with self.assertRaises(ValueError):
+            decoder.read()
+        decoder = Decoder(io.BytesIO(encode([Value(3, 1)])[:10]))
+        with self.assertRaises(ValueError):
+            decoder.read()
+
+
+    def test_forged_counts_are_errors(self):
+        header = struct.pack("<2sBBBB2xQd", b"FZ", 1, 1, 1, 0, 2 ** 60, 0)
+        with self.assertRaises(ValueError):
+            Decoder(io.BytesIO(header + bytes(32))).read()
+        payload = encode(ValueArray([1, 2, 3], 0.5))
+        with self.assertRaises(ValueError):
+            Decoder(io.BytesIO(payload), max_count=2).read()
+        decoder = Decoder(io.BytesIO(payload), max_count=None)
+        self.assertEqual(decoder.read().values(), [1, 2, 3])
+
+
+
+class SwappingTests(TestCase):
+
+    def test_can_swap_bytes(self):
+        swapped = _swap(struct.pack(">2d", 1.5, 2), "float64")
+        self.assertEqual(swapped.tolist(), [1.5, 2])
+        swapped = _swap(struct.pack(">e", 1.5), "float16")
+        self.assertEqual(swapped.tobytes(), struct.pack("<e", 1.5))
@@ -1,3 +1,4 @@
+import pickle
 from unittest import TestCase
 from unittest.mock import Mock, patch
 from fuzz.values import Value
@@ -85,6 +86,19 @@ class ValueReprTests(TestCase):
 
 
 
+class ValuePicklingTests(TestCase):
+
+    def test_can_pickle_value(self):
+        val = pickle.loads(pickle.dumps(Value(23, 0.5)))
+        self.assertEqual(val._value, 23)
+        self.assertEqual(val._error, 0.5)
+
+
+    def test_pickled_values_dont_include_attribute_names(self):
+        self.assertNotIn(b"_value", pickle.dumps(Value(23, 0.5)))
+
+
+
 class ValueAdditionTests(TestCase):
 
     def test_can_add_values(self):
@@ -114,6 +128,12 @@ class ValueAdditionTests(TestCase):
         self.assertEqual(val3._error, 0.4)
 
 
+    def test_addition_defers_to_unknown_operands(self):
+        self.assertIs(Value(23, 0.4).__add__("19"), NotImplemented)
+        with self.assertRaises(TypeError):
+            Value(23, 0.4) + "19"
+
+
 
 class ValueSubtractionTests(TestCase):
 